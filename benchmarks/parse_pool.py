@@ -0,0 +1,90 @@
+"""Benchmark starting the processes that parse sales reports.
+
+Starts the parse pool of the integration like Home Assistant does, with the
+integration imported by its package path, and measures the time until the
+first report is parsed and the modules every worker imported. Compares it
+with workers that import the parser through the __init__ of the integration.
+
+    python benchmarks/parse_pool.py --processes 2
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import gzip
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+HEADER = "SKU\tProduct Type Identifier\tCountry Code\tBegin Date\tEnd Date\tUnits\n"
+HEAVY_MODULES = ["homeassistant", "aiohttp", "google.oauth2", "voluptuous"]
+# evaluated in a worker, builtins are sent by name
+WORKER_MODULES = "sorted(__import__('sys').modules)"
+
+
+def write_report(path: str) -> None:
+    """Write a small gzip compressed sales report."""
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(HEADER)
+        file.write("com.example.app\t1F\tUS\t01/01/2021\t01/01/2021\t3\n")
+
+
+def measure(name: str, executor: ProcessPoolExecutor, path: str) -> None:
+    """Print the time until every worker parsed a report and their imports."""
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.app_statistics.sales_report import read_sales_report_file
+
+    start = time.perf_counter()
+    futures = [
+        executor.submit(read_sales_report_file, path)
+        for _ in range(executor._max_workers)  # pylint: disable=protected-access
+    ]
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+
+    modules = executor.submit(eval, WORKER_MODULES).result()
+    heavy = [module for module in HEAVY_MODULES if module in modules]
+    print(
+        f"{name:12} {elapsed * 1000:8.0f} ms {len(modules):6} modules  "
+        f"{', '.join(heavy) or '-'}"
+    )
+    executor.shutdown()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    # spawned workers run this script again, like Home Assistant it imports
+    # the integration only in the main process
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.app_statistics.parse_pool import ReportParsePool
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "report.csv.gz")
+        write_report(path)
+
+        pool = ReportParsePool(args.processes)
+        # pylint: disable-next=protected-access
+        measure("parse pool", pool._get_executor(), path)
+        measure(
+            "no setup",
+            ProcessPoolExecutor(
+                max_workers=args.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            ),
+            path,
+        )
+
+
+if __name__ == "__main__":
+    main()
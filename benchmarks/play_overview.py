@@ -0,0 +1,110 @@
+"""Benchmark reading the Play installs overview report.
+
+Compares the streaming reader with the pandas based reader it replaced on a
+synthetic UTF-16 report.
+
+    python benchmarks/play_overview.py --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+import importlib.util
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+PACKAGE_NAME = "com.example.app"
+COLUMNS = [
+    "Date",
+    "Package Name",
+    "Daily Device Installs",
+    "Daily Device Uninstalls",
+    "Daily Device Upgrades",
+    "Total User Installs",
+    "Daily User Installs",
+    "Daily User Uninstalls",
+    "Active Device Installs",
+    "Install events",
+    "Update events",
+    "Uninstall events",
+]
+
+
+def load_play_overview():
+    """Load the reader module without importing Home Assistant."""
+    path = os.path.join(
+        os.path.dirname(__file__),
+        "..",
+        "custom_components",
+        "app_statistics",
+        "play_overview.py",
+    )
+    spec = importlib.util.spec_from_file_location("play_overview", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_report(path: str, rows: int) -> None:
+    """Write a synthetic overview report."""
+    day = date(2021, 1, 1)
+    with open(path, "w", encoding="utf-16", newline="") as file:
+        file.write(",".join(COLUMNS) + "\r\n")
+        for index in range(rows):
+            file.write(
+                f"{day + timedelta(days=index % 31)},{PACKAGE_NAME},"
+                f"{index % 50},{index % 7},{index % 30},{index},"
+                f"{index % 40},{index % 5},{index},{index % 60},"
+                f"{index % 33},{index % 8}\r\n"
+            )
+
+
+def read_with_pandas(path: str) -> int:
+    """Read the report like the previous implementation."""
+    _df = pd.read_csv(path, sep=",", encoding="utf-16")
+    df_units = _df.loc[_df["Package Name"] == PACKAGE_NAME]
+    return int(df_units["Active Device Installs"].iloc[-1])
+
+
+def read_with_reader(play_overview, path: str) -> int | None:
+    """Read the downloaded report with the reader of the integration."""
+    with open(path, "rb") as file:
+        return play_overview.read_active_device_installs(file.read(), PACKAGE_NAME)
+
+
+def measure(name: str, func, *args) -> None:
+    """Print wall time and peak memory of a function call."""
+    # time without tracemalloc, tracing slows down pure python code a lot
+    start = time.perf_counter()
+    value = func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:10} {elapsed * 1000:10.1f} ms {peak / 1024:12.0f} KiB  {value}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=31)
+    args = parser.parse_args()
+
+    play_overview = load_play_overview()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "overview.csv")
+        write_report(path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1024:.0f} KiB")
+        measure("pandas", read_with_pandas, path)
+        measure("streaming", read_with_reader, play_overview, path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Benchmark the report refresh of every source without network access.
+
+The Google Cloud Storage client and the AdMob client are replaced by local
+stand-ins and App Store Connect by a local HTTP server, all serving synthetic
+reports. The
+update of every coordinator is timed on an empty report directory (cold) and
+again right after it (warm), and the peak memory of both updates is measured
+in a separate run.
+
+Needs Home Assistant and the requirements of the integration, but no
+credentials or network.
+
+    python benchmarks/refresh.py --years 5 --apps 3 --skus 50 --countries 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+from datetime import date, timedelta
+import gzip
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from aiohttp import web  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+from google.api_core.exceptions import NotModified  # noqa: E402
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+SALES_REPORT_COLUMNS = [
+    "Provider",
+    "Provider Country",
+    "SKU",
+    "Developer",
+    "Title",
+    "Version",
+    "Product Type Identifier",
+    "Units",
+    "Developer Proceeds",
+    "Begin Date",
+    "End Date",
+    "Customer Currency",
+    "Country Code",
+    "Currency of Proceeds",
+    "Apple Identifier",
+    "Customer Price",
+    "Promo Code",
+    "Parent Identifier",
+    "Subscription",
+    "Period",
+    "Category",
+    "CMB",
+    "Device",
+    "Supported Platforms",
+    "Proceeds Reason",
+    "Preserved Pricing",
+    "Client",
+    "Order Type",
+]
+PRODUCT_TYPES = ["1F", "7", "1T", "3F"]
+OVERVIEW_COLUMNS = [
+    "Date",
+    "Package Name",
+    "Daily Device Installs",
+    "Daily Device Uninstalls",
+    "Daily Device Upgrades",
+    "Total User Installs",
+    "Daily User Installs",
+    "Daily User Uninstalls",
+    "Active Device Installs",
+    "Install events",
+    "Update events",
+    "Uninstall events",
+]
+
+
+class Options(types.SimpleNamespace):
+    """Size of the synthetic reports and latency of the stand-ins."""
+
+    years: int
+    apps: int
+    skus: int
+    countries: int
+    latency: float
+    parse_processes: int
+
+
+def app_ids(options: Options) -> list[str]:
+    """Return the bundle IDs of the configured apps."""
+    return [f"com.example.app{index}" for index in range(options.apps)]
+
+
+def sales_report(options: Options, frequency: str, report_date: str) -> str:
+    """Return a synthetic sales report."""
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.app_statistics.report_planner import report_period
+
+    begin, end = report_period({"frequency": frequency, "reportDate": report_date})
+    skus = app_ids(options) + [
+        f"com.example.other{index}" for index in range(options.skus - options.apps)
+    ]
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter="\t", lineterminator="\n")
+    writer.writerow(SALES_REPORT_COLUMNS)
+    for sku_index, sku in enumerate(skus):
+        for country_index in range(options.countries):
+            for product_type in PRODUCT_TYPES:
+                row = dict.fromkeys(SALES_REPORT_COLUMNS, " ")
+                row.update(
+                    {
+                        "Provider": "APPLE",
+                        "Provider Country": "US",
+                        "SKU": sku,
+                        "Title": f"App {sku_index}",
+                        "Version": "1.0",
+                        "Product Type Identifier": product_type,
+                        "Units": (sku_index + country_index) % 17 + 1,
+                        "Developer Proceeds": "0",
+                        "Begin Date": begin.strftime("%m/%d/%Y"),
+                        "End Date": end.strftime("%m/%d/%Y"),
+                        "Customer Currency": "EUR",
+                        "Country Code": f"C{country_index}",
+                        "Currency of Proceeds": "EUR",
+                        "Apple Identifier": str(1000000 + sku_index),
+                        "Customer Price": "0",
+                        "Device": "iPhone",
+                        "Supported Platforms": "iOS",
+                    }
+                )
+                writer.writerow(row[column] for column in SALES_REPORT_COLUMNS)
+    return output.getvalue()
+
+
+async def start_app_store_connect(options: Options) -> tuple[web.AppRunner, str]:
+    """Start a local sales reports endpoint, returns the runner and its URL."""
+
+    async def sales_reports(request: web.Request) -> web.Response:
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return web.json_response({"errors": [{"detail": "No token"}]}, status=401)
+        await asyncio.sleep(options.latency)
+        content = sales_report(
+            options,
+            request.query["filter[frequency]"],
+            request.query["filter[reportDate]"],
+        )
+        return web.Response(
+            body=gzip.compress(content.encode()), content_type="application/a-gzip"
+        )
+
+    app = web.Application()
+    app.router.add_get("/v1/salesReports", sales_reports)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1/salesReports"
+
+
+def write_private_key(path: str) -> None:
+    """Write a new App Store Connect style private key."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    with open(path, "wb") as file:
+        file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+
+
+class FakeBlob:
+    """Stand-in for a storage object with an installs overview."""
+
+    def __init__(self, options: Options, name: str) -> None:
+        """Init the blob."""
+        self.options = options
+        self.name = name
+        self.generation = 1
+        self.md5_hash = "md5-1"
+
+    def download_as_bytes(self, if_generation_not_match: int | None = None) -> bytes:
+        """Return the overview report unless it did not change."""
+        time.sleep(self.options.latency)
+        if if_generation_not_match == self.generation:
+            raise NotModified(self.name)
+
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\r\n")
+        writer.writerow(OVERVIEW_COLUMNS)
+        day = date.today().replace(day=1)
+        for package_name in app_ids(self.options):
+            for offset in range(date.today().day):
+                installs = 1000 + offset
+                writer.writerow(
+                    [day + timedelta(days=offset), package_name]
+                    + [offset % 50] * 6
+                    + [installs]
+                    + [offset % 60] * 3
+                )
+        return output.getvalue().encode("utf-16")
+
+
+class FakeBucket:
+    """Stand-in for a storage bucket."""
+
+    def __init__(self, options: Options) -> None:
+        """Init the bucket."""
+        self.options = options
+
+    def blob(self, name: str) -> FakeBlob:
+        """Return a blob."""
+        return FakeBlob(self.options, name)
+
+
+class FakeStorageClient:
+    """Stand-in for the Google Cloud Storage client."""
+
+    def __init__(self, options: Options) -> None:
+        """Init the client."""
+        self.options = options
+
+    def bucket(self, name: str) -> FakeBucket:
+        """Return a bucket."""
+        return FakeBucket(self.options)
+
+
+class FakeAdmobService:
+    """Stand-in for the AdMob client, answers mediation report requests."""
+
+    def __init__(self, options: Options) -> None:
+        """Init the client."""
+        self.options = options
+        self._body: dict | None = None
+
+    def accounts(self) -> FakeAdmobService:
+        """Return the accounts resource."""
+        return self
+
+    def mediationReport(self) -> FakeAdmobService:  # pylint: disable=invalid-name
+        """Return the mediation report resource."""
+        return self
+
+    def generate(self, parent: str, body: dict) -> FakeAdmobService:
+        """Return the report request."""
+        self._body = body
+        return self
+
+    def execute(self) -> list[dict]:
+        """Return a report with a row per day, app and platform."""
+        time.sleep(self.options.latency)
+        date_range = self._body["report_spec"]["date_range"]
+        day = date(**date_range["start_date"])
+        end = date(**date_range["end_date"])
+        rows: list[dict] = [{"header": {}}]
+        while day <= end:
+            for app_index in range(self.options.apps):
+                for platform in ("ANDROID", "IOS"):
+                    rows.append(
+                        {
+                            "row": {
+                                "dimensionValues": {
+                                    "DATE": {"value": day.strftime("%Y%m%d")},
+                                    "APP": {"value": f"app{app_index}"},
+                                    "PLATFORM": {"value": platform},
+                                },
+                                "metricValues": {
+                                    "ESTIMATED_EARNINGS": {
+                                        "microsValue": str(123456 * (app_index + 1))
+                                    },
+                                    "AD_REQUESTS": {"integerValue": "100"},
+                                    "MATCHED_REQUESTS": {"integerValue": "90"},
+                                },
+                            }
+                        }
+                    )
+            day += timedelta(days=1)
+        rows.append({"footer": {"matchingRowCount": str(len(rows) - 1)}})
+        return rows
+
+
+async def run_updates(
+    options: Options, config_dir: str
+) -> list[tuple[str, float, int | None]]:
+    """Update every source twice in an empty directory.
+
+    Returns the wall time of every update and its peak memory when memory
+    allocations are traced.
+    """
+    # pylint: disable=import-outside-toplevel
+    from custom_components.app_statistics import (
+        api as api_module,
+        app_store_connect,
+    )
+    from custom_components.app_statistics.const import SOURCES
+    from custom_components.app_statistics.report_coordinator import (
+        ReportCoordinator,
+    )
+
+    api_module.REPORTS_START_DATE = date(date.today().year - options.years, 1, 1)
+    runner, app_store_connect.SALES_REPORTS_URL = await start_app_store_connect(options)
+    write_private_key(os.path.join(config_dir, "key.p8"))
+
+    hass = HomeAssistant()
+    hass.config.config_dir = config_dir
+    credentials = types.SimpleNamespace(refresh_token="token", client_id="client")
+    bundle_ids = ",".join(app_ids(options))
+    api = api_module.ReportApi(
+        hass,
+        entry_id="benchmark",
+        play_service_account_path=os.path.join(config_dir, "service_account.json"),
+        bucket_name="bucket",
+        play_bundle_id=bundle_ids,
+        ios_bundle_id=bundle_ids,
+        ios_key_id="key",
+        ios_key_path=os.path.join(config_dir, "key.p8"),
+        ios_issuer_id="issuer",
+        admob_publisher_id="pub-0",
+        admob_credentials=credentials,
+        parse_processes=options.parse_processes,
+    )
+    api._storage_client = FakeStorageClient(options)
+    api._admob_service = FakeAdmobService(options)
+    api._admob_service_credentials = ("token", "client")
+
+    results = []
+    try:
+        for source in SOURCES:
+            coordinator = ReportCoordinator(
+                hass, api, source, timedelta(hours=1), "benchmark"
+            )
+            for state in ("cold", "warm"):
+                if tracemalloc.is_tracing():
+                    tracemalloc.reset_peak()
+                start = time.perf_counter()
+                await coordinator._async_update_data()
+                elapsed = time.perf_counter() - start
+                peak = None
+                if tracemalloc.is_tracing():
+                    peak = tracemalloc.get_traced_memory()[1]
+                results.append((f"{source} {state}", elapsed, peak))
+    finally:
+        await api.executor.async_add_job(api.close)
+        await hass.async_add_executor_job(api.executor.shutdown)
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+    return results
+
+
+def measure(options: Options) -> None:
+    """Print wall time and peak memory of the cold and warm updates."""
+    # time without tracemalloc, tracing slows down pure python code a lot
+    with tempfile.TemporaryDirectory() as config_dir:
+        timings = asyncio.run(run_updates(options, config_dir))
+
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        peaks = asyncio.run(run_updates(options, config_dir))
+    tracemalloc.stop()
+
+    for (name, elapsed, _), (_, _, peak) in zip(timings, peaks):
+        print(f"{name:16} {elapsed * 1000:10.1f} ms {peak / 1024:12.0f} KiB")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=3, help="years of history")
+    parser.add_argument("--apps", type=int, default=2, help="configured apps")
+    parser.add_argument("--skus", type=int, default=20, help="SKUs in a report")
+    parser.add_argument("--countries", type=int, default=20)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds per request"
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="processes that parse sales reports",
+    )
+    args = parser.parse_args()
+
+    options = Options(
+        years=args.years,
+        apps=args.apps,
+        skus=max(args.skus, args.apps),
+        countries=args.countries,
+        latency=args.latency,
+        parse_processes=args.parse_processes,
+    )
+    print(
+        f"{options.years} years, {options.apps} apps, {options.skus} SKUs, "
+        f"{options.countries} countries"
+    )
+    measure(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Benchmark reading an App Store Connect sales report.
+
+Compares the chunked reader of the needed columns with reading every column
+of the decompressed report, on a synthetic yearly report of many SKUs.
+
+    python benchmarks/sales_report.py --skus 2000 --countries 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from datetime import datetime
+import gzip
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+import pandas as pd
+
+COLUMNS = [
+    "Provider",
+    "Provider Country",
+    "SKU",
+    "Developer",
+    "Title",
+    "Version",
+    "Product Type Identifier",
+    "Units",
+    "Developer Proceeds",
+    "Begin Date",
+    "End Date",
+    "Customer Currency",
+    "Country Code",
+    "Currency of Proceeds",
+    "Apple Identifier",
+    "Customer Price",
+    "Promo Code",
+    "Parent Identifier",
+    "Subscription",
+    "Period",
+    "Category",
+    "CMB",
+    "Device",
+    "Supported Platforms",
+    "Proceeds Reason",
+    "Preserved Pricing",
+    "Client",
+    "Order Type",
+]
+PRODUCT_TYPES = ["1F", "7", "1T", "3F"]
+
+
+def load_sales_report():
+    """Load the reader module without importing Home Assistant."""
+    # the package is registered without running its __init__, which sets up
+    # the integration
+    package = types.ModuleType("app_statistics")
+    package.__path__ = [
+        os.path.join(
+            os.path.dirname(__file__), "..", "custom_components", "app_statistics"
+        )
+    ]
+    sys.modules["app_statistics"] = package
+    return importlib.import_module("app_statistics.sales_report")
+
+
+def write_report(path: str, skus: int, countries: int) -> None:
+    """Write a synthetic gzip compressed yearly sales report."""
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+        writer.writerow(COLUMNS)
+        for sku_index in range(skus):
+            for country_index in range(countries):
+                for product_type in PRODUCT_TYPES:
+                    row = dict.fromkeys(COLUMNS, " ")
+                    row.update(
+                        {
+                            "Provider": "APPLE",
+                            "Provider Country": "US",
+                            "SKU": f"com.example.app{sku_index}",
+                            "Developer": "Example Developer",
+                            "Title": f"Example App {sku_index}",
+                            "Version": "1.0",
+                            "Product Type Identifier": product_type,
+                            "Units": (sku_index + country_index) % 17 + 1,
+                            "Developer Proceeds": "0",
+                            "Begin Date": "01/01/2021",
+                            "End Date": "12/31/2021",
+                            "Customer Currency": "EUR",
+                            "Country Code": f"C{country_index}",
+                            "Currency of Proceeds": "EUR",
+                            "Apple Identifier": str(1000000 + sku_index),
+                            "Customer Price": "0",
+                            "Category": "Utilities",
+                            "Device": "iPhone",
+                            "Supported Platforms": "iOS",
+                        }
+                    )
+                    writer.writerow(row[column] for column in COLUMNS)
+
+
+def read_with_pandas(sales_report, path: str) -> int:
+    """Read every column of the decompressed report like the previous reader."""
+    with open(path, "rb") as file:
+        report = gzip.decompress(file.read())
+    _df = pd.read_csv(
+        io.BytesIO(report),
+        sep="\t",
+        dtype={column: str for column in sales_report.GROUP_COLUMNS},
+    )
+    grouped = _df.groupby(sales_report.GROUP_COLUMNS, dropna=False)["Units"].sum()
+    rows = [
+        (
+            sku if isinstance(sku, str) else None,
+            product_type if isinstance(product_type, str) else None,
+            country if isinstance(country, str) else None,
+            datetime.strptime(begin, "%m/%d/%Y").date().isoformat(),
+            datetime.strptime(end, "%m/%d/%Y").date().isoformat(),
+            int(units),
+        )
+        for (sku, product_type, country, begin, end), units in grouped.items()
+    ]
+    return len(rows)
+
+
+def read_with_reader(sales_report, path: str) -> int:
+    """Read the report with the reader of the integration."""
+    return len(sales_report.read_sales_report_file(path))
+
+
+def measure(name: str, func, *args) -> None:
+    """Print wall time and peak memory of a function call."""
+    # time without tracemalloc, tracing slows down pure python code a lot
+    start = time.perf_counter()
+    value = func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:10} {elapsed * 1000:10.1f} ms {peak / 1024:12.0f} KiB  {value}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=500)
+    parser.add_argument("--countries", type=int, default=50)
+    args = parser.parse_args()
+
+    sales_report = load_sales_report()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "report.csv.gz")
+        write_report(path, args.skus, args.countries)
+        rows = args.skus * args.countries * len(PRODUCT_TYPES)
+        print(f"{rows} rows, {os.path.getsize(path) / 1024:.0f} KiB compressed")
+        measure("pandas", read_with_pandas, sales_report, path)
+        measure("chunked", read_with_reader, sales_report, path)
+
+
+if __name__ == "__main__":
+    main()
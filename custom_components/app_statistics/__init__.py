@@ -1,23 +1,39 @@
 """The App Statistics integration."""
 from __future__ import annotations
+import asyncio
 from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
 import logging
+import shutil
 from typing import Any
 import google.oauth2.credentials
 
 import aiohttp
-from .report_coordinator import ReportCoordinator
-from homeassistant.exceptions import ConfigEntryNotReady
+import voluptuous as vol
+from .api import ReportApi
+from .poll_schedule import source_poll_schedule
+from .report_coordinator import ReportCoordinator, snapshot_store
+from .report_files import migrate_report_directory
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
 from homeassistant.helpers import json
 
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+import homeassistant.helpers.config_validation as cv
 
 
 from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_SOURCE,
+    CONF_ADAPTIVE_POLLING,
     CONF_ADMOB_CLIENT_ID,
+    CONF_ADMOB_SETTLE_DAYS,
+    CONF_ADMOB_UPDATE_INTERVAL,
+    CONF_APP_STORE_UPDATE_INTERVAL,
+    CONF_EXECUTOR_WORKERS,
     CONF_ADMOB_CLIENT_SECRET,
     CONF_ADMOB_PUBLISHER_ID,
     CONF_BUCKET_NAME,
@@ -25,15 +41,37 @@ from .const import (
     CONF_IOS_CONNECT_ISSUER_ID,
     CONF_IOS_CONNECT_KEY_ID,
     CONF_IOS_CONNECT_KEY_PATH,
+    CONF_IOS_DOWNLOAD_WORKERS,
+    CONF_PARSE_PROCESSES,
     CONF_PLAY_BUNDLE_ID,
     CONF_PLAY_SERVICE_ACCOUNT_PATH,
+    CONF_PLAY_UPDATE_INTERVAL,
+    CONF_REPORT_CACHE_SIZE,
+    DATA_BACKFILL_TASKS,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ADMOB_SETTLE_DAYS,
+    DEFAULT_ADMOB_UPDATE_INTERVAL,
+    DEFAULT_APP_STORE_UPDATE_INTERVAL,
+    DEFAULT_EXECUTOR_WORKERS,
+    DEFAULT_IOS_DOWNLOAD_WORKERS,
+    DEFAULT_PARSE_PROCESSES,
+    DEFAULT_PLAY_UPDATE_INTERVAL,
+    DEFAULT_REPORT_CACHE_SIZE,
     DOMAIN,
+    SERVICE_BACKFILL_STATISTICS,
+    SERVICE_REFRESH,
+    SOURCE_ADMOB,
+    SOURCE_APP_STORE,
+    SOURCE_PLAY,
+    SOURCES,
 )
 from homeassistant.helpers.config_entry_oauth2_flow import (
     OAuth2Session,
     async_get_config_entry_implementation,
 )
 
+LEGACY_REPORTS_PATH = "app_statistics/reports"
+
 # For your initial PR, limit it to 1 platform.
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
@@ -51,6 +89,74 @@ class HomeAssistantAppStatisticsData:
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Spotify integration."""
+
+    async def async_backfill(call: ServiceCall) -> None:
+        """Import the history of the reports into the long-term statistics."""
+        if "recorder" not in hass.config.components:
+            raise HomeAssistantError("The recorder is needed to import statistics")
+
+        # the recorder is only imported when the history is imported
+        # pylint: disable-next=import-outside-toplevel
+        from .backfill import async_backfill_statistics
+
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        for coordinators_entry_id, coordinators in list(
+            hass.data.get(DOMAIN, {}).items()
+        ):
+            if entry_id is not None and entry_id != coordinators_entry_id:
+                continue
+            # the import is tracked, so unloading the entry cancels it before
+            # the executor it uses is shut down
+            task = hass.async_create_task(
+                async_backfill_statistics(hass, coordinators[SOURCE_ADMOB].api)
+            )
+            tasks = hass.data.setdefault(DATA_BACKFILL_TASKS, {}).setdefault(
+                coordinators_entry_id, set()
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await asyncio.wait([task])
+            if task.cancelled():
+                raise HomeAssistantError(
+                    "The import of the statistics stopped, the entry was unloaded"
+                )
+            task.result()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL_STATISTICS,
+        async_backfill,
+        schema=vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string}),
+    )
+
+    async def async_refresh(call: ServiceCall) -> None:
+        """Refresh the reports of a source, or of all sources."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        source = call.data.get(ATTR_SOURCE)
+        await asyncio.gather(
+            *(
+                coordinator.async_request_refresh()
+                for coordinators_entry_id, coordinators in hass.data.get(
+                    DOMAIN, {}
+                ).items()
+                if entry_id is None or entry_id == coordinators_entry_id
+                for coordinator_source, coordinator in coordinators.items()
+                if source is None or source == coordinator_source
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_refresh,
+        schema=vol.Schema(
+            {
+                vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+                vol.Optional(ATTR_SOURCE): vol.In(SOURCES),
+            }
+        ),
+    )
+
     if DOMAIN not in config:
         return True
 
@@ -80,8 +186,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         enable_reauth_refresh=True,
     )
 
-    coordinator = ReportCoordinator(
+    api = ReportApi(
         hass,
+        entry_id=entry.entry_id,
         play_service_account_path=entry.data["reports"][CONF_PLAY_SERVICE_ACCOUNT_PATH],
         bucket_name=entry.data["reports"][CONF_BUCKET_NAME],
         play_bundle_id=entry.data["reports"][CONF_PLAY_BUNDLE_ID],
@@ -91,26 +198,110 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ios_issuer_id=entry.data["reports"][CONF_IOS_CONNECT_ISSUER_ID],
         admob_publisher_id=entry.data["reports"][CONF_ADMOB_PUBLISHER_ID],
         admob_credentials=credentials,
+        ios_download_workers=entry.options.get(
+            CONF_IOS_DOWNLOAD_WORKERS, DEFAULT_IOS_DOWNLOAD_WORKERS
+        ),
+        admob_settle_days=entry.options.get(
+            CONF_ADMOB_SETTLE_DAYS, DEFAULT_ADMOB_SETTLE_DAYS
+        ),
+        executor_workers=entry.options.get(
+            CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS
+        ),
+        report_cache_size=entry.options.get(
+            CONF_REPORT_CACHE_SIZE, DEFAULT_REPORT_CACHE_SIZE
+        ),
+        parse_processes=entry.options.get(
+            CONF_PARSE_PROCESSES, DEFAULT_PARSE_PROCESSES
+        ),
+    )
+
+    # Reports used to be stored relative to the working directory
+    await api.executor.async_add_job(
+        migrate_report_directory, LEGACY_REPORTS_PATH, api.reports_path
+    )
+
+    update_intervals = {
+        SOURCE_ADMOB: entry.options.get(
+            CONF_ADMOB_UPDATE_INTERVAL, DEFAULT_ADMOB_UPDATE_INTERVAL
+        ),
+        SOURCE_PLAY: entry.options.get(
+            CONF_PLAY_UPDATE_INTERVAL, DEFAULT_PLAY_UPDATE_INTERVAL
+        ),
+        SOURCE_APP_STORE: entry.options.get(
+            CONF_APP_STORE_UPDATE_INTERVAL, DEFAULT_APP_STORE_UPDATE_INTERVAL
+        ),
+    }
+    adaptive_polling = entry.options.get(
+        CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+    )
+    coordinators = {
+        source: ReportCoordinator(
+            hass,
+            api=api,
+            source=source,
+            update_interval=timedelta(minutes=update_intervals[source]),
+            entry_id=entry.entry_id,
+            poll_schedule=(
+                source_poll_schedule(
+                    source, timedelta(minutes=update_intervals[source])
+                )
+                if adaptive_polling
+                else None
+            ),
+        )
+        for source in SOURCES
+    }
+
+    # Publish the last known data right away, the reports are refreshed in the
+    # background so setup does not wait for the stores
+    await asyncio.gather(
+        *(coordinator.async_load_snapshot() for coordinator in coordinators.values())
     )
-    await coordinator.async_config_entry_first_refresh()
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = coordinators
 
     hass.config_entries.async_setup_platforms(entry, PLATFORMS)
+
+    for coordinator in coordinators.values():
+        coordinator.async_start_refresh()
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinators = hass.data[DOMAIN].pop(entry.entry_id)
+        api = coordinators[SOURCE_APP_STORE].api
+        backfills = hass.data.get(DATA_BACKFILL_TASKS, {}).pop(entry.entry_id, set())
+        for task in backfills:
+            task.cancel()
+        await asyncio.gather(*backfills, return_exceptions=True)
+        await asyncio.gather(
+            *(coordinator.async_shutdown() for coordinator in coordinators.values())
+        )
+        # waiting for the running jobs blocks, so it is done in the shared
+        # executor, the API is closed when no job uses it anymore
+        await hass.async_add_executor_job(api.executor.shutdown)
+        await hass.async_add_executor_job(api.close)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the last known data and the reports of a config entry."""
+    for source in SOURCES:
+        await snapshot_store(hass, entry.entry_id, source).async_remove()
+    await hass.async_add_executor_job(
+        partial(
+            shutil.rmtree, hass.config.path(DOMAIN, entry.entry_id), ignore_errors=True
+        )
+    )
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -1,20 +1,31 @@
 """Generate mediation reports."""
 
+from __future__ import annotations
+
 from datetime import date
-from googleapiclient.discovery import Resource
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import google.oauth2.credentials
+    from googleapiclient.discovery import Resource
 
-import google.oauth2.credentials
-from googleapiclient.discovery import build
+# Seconds before a request to the AdMob API times out
+ADMOB_REQUEST_TIMEOUT = 60
 
 
 def generate_mediation_report(
-    service: Resource, publisher_id: str, start_date: date, end_date: date
+    service: Resource,
+    publisher_id: str,
+    start_date: date,
+    end_date: date,
+    by_date: bool = False,
 ) -> list[dict]:
     """Generate and print a mediation report.
 
     Args:
       service: An AdMob Service Object.
       publisher_id: An ID that identifies the publisher.
+      by_date: Split the report rows per day with the DATE dimension.
     """
 
     date_range = {
@@ -32,12 +43,16 @@ def generate_mediation_report(
 
     # Set dimensions.
     dimensions = ["APP", "PLATFORM"]
+    if by_date:
+        dimensions.insert(0, "DATE")
 
     # Set metrics.
     metrics = ["ESTIMATED_EARNINGS", "AD_REQUESTS", "MATCHED_REQUESTS"]
 
     # Set sort conditions.
     sort_conditions = [{"dimension": "APP", "order": "ASCENDING"}]
+    if by_date:
+        sort_conditions.insert(0, {"dimension": "DATE", "order": "ASCENDING"})
 
     # Create mediation report specifications.
     report_spec = {
@@ -61,12 +76,21 @@ def generate_mediation_report(
     return response
 
 
-def get_mediation_report(
-    credentials: google.oauth2.credentials,
-    publisher_id: str,
-    start_date: date,
-    end_date: date,
-) -> list[dict]:
-    """Create Admob API client and get mediation report."""
-    service = build("admob", "v1", credentials=credentials)
-    return generate_mediation_report(service, publisher_id, start_date, end_date)
+def build_admob_service(credentials: google.oauth2.credentials) -> Resource:
+    """Build an AdMob API client.
+
+    The discovery document is read from the copy bundled with the API client
+    instead of being fetched, and the returned client reuses its HTTP
+    connection between requests.
+    """
+    # the API client is slow to import, only import it in the executor
+    # pylint: disable=import-outside-toplevel
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
+    import httplib2
+
+    http = AuthorizedHttp(
+        credentials, http=httplib2.Http(timeout=ADMOB_REQUEST_TIMEOUT)
+    )
+    return build("admob", "v1", http=http, cache_discovery=False, static_discovery=True)
+
@@ -1,42 +1,104 @@
 """Fetch reports."""
 
 from __future__ import annotations
-import calendar
+from collections.abc import Awaitable, Callable
+import asyncio
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
 import logging
-import math
 import os
-from typing import Any
-import google.oauth2.credentials
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+import async_timeout
 
-from google.cloud import storage
-from appstoreconnect_BPHvZ import Api
-
-import pandas as pd
 from .admob.generate_mediation_report import (
-    get_mediation_report,
+    build_admob_service,
+    generate_mediation_report,
+)
+from .app_store_connect import AppStoreConnectClient, AppStoreConnectError
+from .executor import ReportExecutor
+from .metrics import SourceMetrics
+from .parse_pool import ReportParsePool
+from .play_overview import (
+    read_active_device_installs,
+    read_active_device_installs_history,
 )
+from .report_cache import ReportCache
+from .report_files import CorruptReportError, ReportFiles
+from .report_planner import (
+    FREQUENCY_MONTHLY,
+    FREQUENCY_YEARLY,
+    available_from,
+    ingested_cover,
+    parse_report_key,
+    plan_reports,
+    report_key,
+    retry_after,
+    superseded_reports,
+)
+from .sales_report import INSTALL_PRODUCT_TYPES
+from .sales_store import SalesStore
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 
 from .const import (
+    ADMOB_DAILY_EARNINGS,
+    DEFAULT_ADMOB_SETTLE_DAYS,
+    DEFAULT_EXECUTOR_WORKERS,
+    DEFAULT_IOS_DOWNLOAD_WORKERS,
+    DEFAULT_PARSE_PROCESSES,
+    DEFAULT_REPORT_CACHE_SIZE,
+    DOMAIN,
+    REPORTS_START_DATE,
     SENSOR_ADMOB_REVENUE_MONTH,
     SENSOR_ADMOB_REVENUE_TODAY,
     SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS,
     SENSOR_IOS_TOTAL_INSTALLS,
+    SOURCE_ADMOB,
+    SOURCE_APP_STORE,
+    SOURCE_PLAY,
+    SOURCE_TIMEOUTS,
+    SOURCES,
 )
 
+if TYPE_CHECKING:
+    # pandas and the store clients are slow to import, they are imported in the
+    # executor jobs that use them instead of on the event loop
+    from google.cloud import storage
+    import google.oauth2.credentials
+    from googleapiclient.discovery import Resource
+
 _LOGGER = logging.getLogger(__name__)
 
 
+def ios_report_name(reporting_date: dict[str, str]) -> str:
+    """Return the name a sales report is stored with."""
+    return "ios/{}-report.csv".format(report_key(reporting_date))
+
+
+def play_overview_blob_name(play_bundle_id: str, month: date) -> str:
+    """Return the name of the installs overview of an app for a month."""
+    return "installs_{}_{}_overview.csv".format(play_bundle_id, month.strftime("%Y%m"))
+
+
+def split_bundle_ids(bundle_ids: str) -> list[str]:
+    """Return the app bundle IDs of a comma separated config value."""
+    return [
+        bundle_id.strip() for bundle_id in bundle_ids.split(",") if bundle_id.strip()
+    ]
+
+
 class ReportApi:
     """Fetch reports."""
 
     def __init__(
         self,
         hass: HomeAssistant,
+        entry_id: str,
         play_service_account_path: str,
         bucket_name: str,
         play_bundle_id: str,
@@ -46,224 +108,550 @@ class ReportApi:
         ios_issuer_id: str,
         admob_publisher_id: str,
         admob_credentials: google.oauth2.credentials.Credentials,
+        ios_download_workers: int = DEFAULT_IOS_DOWNLOAD_WORKERS,
+        admob_settle_days: int = DEFAULT_ADMOB_SETTLE_DAYS,
+        executor_workers: int = DEFAULT_EXECUTOR_WORKERS,
+        report_cache_size: int = DEFAULT_REPORT_CACHE_SIZE,
+        parse_processes: int = DEFAULT_PARSE_PROCESSES,
     ) -> None:
         """Init report API."""
 
         self.hass = hass
         self.bucket_name = bucket_name
-        self.play_bundle_id = play_bundle_id
-        self.ios_bundle_id = ios_bundle_id
+        self.play_bundle_ids = split_bundle_ids(play_bundle_id)
+        self.ios_bundle_ids = split_bundle_ids(ios_bundle_id)
         self.ios_key_id = ios_key_id
         self.ios_key_path = ios_key_path
         self.ios_issuer_id = ios_issuer_id
         self.admob_publisher_id = admob_publisher_id
         self.admob_credentials = admob_credentials
+        self.ios_download_workers = ios_download_workers
+        self.admob_settle_days = admob_settle_days
+
+        # The AdMob client is built once and reused until the credentials rotate
+        self._admob_service: Resource | None = None
+        self._admob_service_credentials: tuple[str | None, str | None] | None = None
+        self._admob_lock = threading.Lock()
+
+        # Downloaded reports and caches are kept in the configuration directory,
+        # every config entry has its own indexes and caches
+        self.reports_path = hass.config.path(DOMAIN, entry_id, "reports")
+
+        # Raw reports, compressed and limited to the cache size in MiB
+        self.report_files = ReportFiles(
+            self.reports_path, report_cache_size * 1024 * 1024
+        )
+
+        # Earnings per day that are older than the settle window
+        self.admob_earnings_cache = ReportCache(
+            os.path.join(
+                self.reports_path, "admob", f"earnings_{admob_publisher_id}.json"
+            )
+        )
+
+        # Rows of the downloaded sales reports, every report is parsed only once
+        self.sales_store = SalesStore(
+            os.path.join(self.reports_path, "ios", "sales.db")
+        )
+
+        # Reason, attempts and retry time of the sales reports that could not
+        # be downloaded
+        self.ios_unavailable_cache = ReportCache(
+            os.path.join(self.reports_path, "ios", "unavailable.json")
+        )
+
+        # Blocking jobs run on workers of the config entry
+        self.executor = ReportExecutor(executor_workers, DOMAIN)
+
+        # Sales reports are parsed in worker processes when they are enabled
+        self.parse_pool = ReportParsePool(parse_processes)
+
+        # The signed token of the client is reused between updates
+        self.app_store_client = AppStoreConnectClient(
+            self.executor,
+            async_get_clientsession(hass),
+            key_id=ios_key_id,
+            key_path=ios_key_path,
+            issuer_id=ios_issuer_id,
+            vendor_number="87483853",
+        )
+
+        self._storage_client: storage.Client | None = None
+
+        # Wall time, downloads, parsed reports, cache use and errors per source
+        self.metrics = {source: SourceMetrics() for source in SOURCES}
+
+        # Generation, md5 and parsed result of the downloaded Play reports
+        self.play_overview_cache = ReportCache(
+            os.path.join(self.reports_path, "android", "overview.json")
+        )
 
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = play_service_account_path
 
-    def get_report_from_bucket(
-        self,
-    ) -> None:
-        """Download a blob from the bucket."""
+    def close(self) -> None:
+        """Release the resources of the report API."""
+        self.sales_store.close()
+        self.parse_pool.shutdown()
 
-        result = {
-            SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS: 0,
-        }
+    def get_storage_client(self) -> storage.Client:
+        """Return the storage client, it is kept for the lifetime of the entry."""
+        if self._storage_client is None:
+            from google.cloud import storage  # pylint: disable=import-outside-toplevel
+
+            self._storage_client = storage.Client()
+        return self._storage_client
+
+    def get_active_installs_from_bucket(self, play_bundle_id: str) -> int:
+        """Download the installs overview of an app from the bucket."""
+        # pylint: disable-next=import-outside-toplevel
+        from google.api_core.exceptions import NotModified
 
         # The ID of your GCS bucket
         bucket_name = self.bucket_name
 
         # The ID of your GCS object
         source_blob_dir = "stats/installs/"
-        source_blob_name = (
-            "installs_"
-            + self.play_bundle_id
-            + "_"
-            + str(date.today().year)
-            + str(date.today().month).zfill(2)
-            + "_overview.csv"
-        )
+        source_blob_name = play_overview_blob_name(play_bundle_id, date.today())
         source_blob_full_path = source_blob_dir + source_blob_name
 
-        # The path to which the file should be downloaded
-        destination_file_name = "app_statistics/reports/android/" + source_blob_name
-        os.makedirs("app_statistics/reports/android", exist_ok=True)
-
-        storage_client = storage.Client()
-
-        bucket = storage_client.bucket(bucket_name)
+        bucket = self.get_storage_client().bucket(bucket_name)
 
         # Construct a client side representation of a blob.
         # Note `Bucket.blob` differs from `Bucket.get_blob` as it doesn't retrieve
         # any content from Google Cloud Storage. As we don't need additional data,
         # using `Bucket.blob` is preferred here.
         blob = bucket.blob(source_blob_full_path)
-        blob.download_to_filename(destination_file_name)
 
+        # only download the report when it changed since the last update
+        cached = self.play_overview_cache.get(source_blob_full_path)
+        if cached is not None and "active_installs" not in cached:
+            cached = None
+        try:
+            content = blob.download_as_bytes(
+                if_generation_not_match=cached["generation"] if cached else None
+            )
+        except NotModified:
+            self.metrics[SOURCE_PLAY].add(cache_hits=1)
+            _LOGGER.debug(
+                "Storage object %s from bucket %s is unchanged",
+                source_blob_full_path,
+                bucket_name,
+            )
+            return cached["active_installs"]
+
+        self.metrics[SOURCE_PLAY].add(cache_misses=1, bytes_downloaded=len(content))
         _LOGGER.debug(
-            "Downloaded storage object %s from bucket %s to local file %s",
+            "Downloaded storage object %s from bucket %s",
             source_blob_full_path,
             bucket_name,
-            destination_file_name,
         )
 
-        _df = pd.read_csv(destination_file_name, sep=",", encoding="utf-16")
-        _LOGGER.debug(_df.to_string())
-        df_units = _df.loc[_df["Package Name"] == self.play_bundle_id]
-        result[SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS] = df_units[
-            "Active Device Installs"
-        ].iloc[-1]
+        if cached and blob.md5_hash is not None and cached["md5"] == blob.md5_hash:
+            # a new generation with the same content
+            active_installs = cached["active_installs"]
+        else:
+            # the downloaded report is parsed in memory, the stored copy is
+            # only read for the history
+            self.report_files.write("android/" + source_blob_name, content)
+            active_installs = read_active_device_installs(content, play_bundle_id)
+            self.metrics[SOURCE_PLAY].add(reports_parsed=1)
+            if active_installs is None:
+                raise ValueError(
+                    f"No installs of {play_bundle_id} in {source_blob_name}"
+                )
 
-        return result
+        self.play_overview_cache.set(
+            source_blob_full_path,
+            {
+                "generation": blob.generation,
+                "md5": blob.md5_hash,
+                "active_installs": active_installs,
+            },
+        )
+        self.play_overview_cache.save()
 
-    def ios_reporting_dates(self, start_date: date) -> list[dict[str, str]]:
-        """Get all reporting dates between a starting date and today."""
-        result = []
-        today = date.today()
-        year_difference = today.year - start_date.year
-        while year_difference > 0:
-            result.append(
-                {
-                    "frequency": "YEARLY",
-                    "reportDate": date(today.year - year_difference, 1, 1).strftime(
-                        "%Y"
-                    ),
-                }
-            )
-            year_difference -= 1
-        month_difference = today.month - 1
-        while month_difference > 0:
-            result.append(
-                {
-                    "frequency": "MONTHLY",
-                    "reportDate": date(today.year, month_difference, 1).strftime(
-                        "%Y-%m"
-                    ),
-                }
-            )
-            month_difference -= 1
+        return active_installs
 
-        current_month = date(today.year, today.month, 1)
-        while current_month.month == today.month:
-            # every sunday that has passed of the current month except if today is monday
-            # the week report isn't ready yet on monday, so use the daily reports of the pas week instead
-            if (
-                current_month.weekday() == 6
-                and today.day > current_month.day
-                and current_month.day != today.day - 1
-            ):
-                result.append(
-                    {
-                        "frequency": "WEEKLY",
-                        "reportDate": current_month.strftime("%Y-%m-%d"),
-                    }
+    def get_report_from_bucket(
+        self, previous: dict[str, Any] | None = None
+    ) -> dict[str, dict[str, int]]:
+        """Download the installs overviews of all apps from the bucket.
+
+        Every app has its own overview report in the bucket, an app that can
+        not be updated does not block the other apps and keeps its value of
+        the previous data.
+        """
+        previous_installs = (previous or {}).get(
+            SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS, {}
+        )
+        active_installs: dict[str, int] = {}
+        errors: list[Exception] = []
+        for play_bundle_id in self.play_bundle_ids:
+            try:
+                active_installs[play_bundle_id] = self.get_active_installs_from_bucket(
+                    play_bundle_id
                 )
-                # print(current_month, "week completed")
-            current_month += timedelta(days=1)
+            except Exception as err:
+                _LOGGER.error("Could not update %s: %s", play_bundle_id, err)
+                self.metrics[SOURCE_PLAY].add(errors=1)
+                errors.append(err)
+                if play_bundle_id in previous_installs:
+                    active_installs[play_bundle_id] = previous_installs[play_bundle_id]
 
-        monday_this_week = date(today.year, today.month, today.day - today.weekday())
-        if current_month.day != today.day - 1 and today.day > 7:
-            # use monday last week if today is monday and the last week report is not ready yet
-            monday_this_week = date(today.year, today.month, today.day - 7)
+        if errors and len(errors) == len(self.play_bundle_ids):
+            raise errors[0]
 
-        while monday_this_week.day < today.day:
-            result.append(
-                {
-                    "frequency": "DAILY",
-                    "reportDate": monday_this_week.strftime("%Y-%m-%d"),
-                }
-            )
-            # print(monday_this_week, "days completed")
-            monday_this_week += timedelta(days=1)
+        return {SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS: active_installs}
+
+    def ios_reporting_dates(self, start_date: date) -> list[dict[str, str]]:
+        """Get the available reporting dates from a starting date on."""
+        result = plan_reports(start_date, datetime.now(timezone.utc))
         _LOGGER.debug(result)
         return result
 
-    def get_report_from_app_store_connect(self) -> dict[str, int]:
-        """Download sales report from app store connect."""
-        result = {
-            SENSOR_IOS_TOTAL_INSTALLS: 0,
-        }
-
-        # https://help.apple.com/app-store-connect/en.lproj/static.html#dev63c6f4502
-        product_identifiers_installs = ["1", "1F", "1T", "F1"]
+    async def async_download_ios_reports(
+        self, reporting_dates: list[dict[str, str]]
+    ) -> dict[str, BaseException]:
+        """Download sales reports concurrently.
+
+        Returns the errors of the reports that could not be downloaded, keyed
+        by report key.
+        """
+        semaphore = asyncio.Semaphore(self.ios_download_workers)
+
+        async def download(reporting_date: dict[str, str]) -> None:
+            async with semaphore:
+                _LOGGER.debug(
+                    "download report %s %s",
+                    reporting_date["frequency"],
+                    reporting_date["reportDate"],
+                )
+                size = await self.app_store_client.async_download_sales_report(
+                    reporting_date["frequency"],
+                    reporting_date["reportDate"],
+                    self.report_files.file_path(ios_report_name(reporting_date)),
+                )
+            self.metrics[SOURCE_APP_STORE].add(cache_misses=1, bytes_downloaded=size)
 
-        api = Api(
-            key_id=self.ios_key_id,
-            key_file=self.ios_key_path,
-            issuer_id=self.ios_issuer_id,
+        results = await asyncio.gather(
+            *(download(reporting_date) for reporting_date in reporting_dates),
+            return_exceptions=True,
         )
+        errors: dict[str, BaseException] = {}
+        for reporting_date, result in zip(reporting_dates, results):
+            if isinstance(result, BaseException):
+                _LOGGER.error(
+                    "Could not download %s report %s: %s",
+                    reporting_date["frequency"],
+                    reporting_date["reportDate"],
+                    result,
+                )
+                self.metrics[SOURCE_APP_STORE].add(errors=1)
+                errors[report_key(reporting_date)] = result
+        return errors
 
-        reporting_dates = self.ios_reporting_dates(start_date=date(2021, 1, 1))
-        os.makedirs("app_statistics/reports/ios", exist_ok=True)
+    def due_ios_reports(
+        self,
+    ) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+        """Return the planned reports and the reports that are due for a download.
+
+        A report that could not be downloaded is not requested again before
+        its retry time, which grows with every failed attempt.
+        """
+        reporting_dates = self.ios_reporting_dates(start_date=REPORTS_START_DATE)
+        os.makedirs(os.path.join(self.reports_path, "ios"), exist_ok=True)
+
+        ingested = self.sales_store.report_keys()
+        self.metrics[SOURCE_APP_STORE].add(
+            cache_hits=sum(
+                report_key(reporting_date) in ingested
+                for reporting_date in reporting_dates
+            )
+        )
 
-        # get all reports
+        now = datetime.now(timezone.utc)
+        due = []
+        # only download new reports
         for reporting_date in reporting_dates:
-            frequency = reporting_date["frequency"]
-            report_date = reporting_date["reportDate"]
-            file_path = "app_statistics/reports/ios/{}-{}-report.csv".format(
-                frequency, report_date
+            if (
+                report_key(reporting_date) in ingested
+                or ios_report_name(reporting_date) in self.report_files
+            ):
+                continue
+            unavailable = self.ios_unavailable_cache.get(report_key(reporting_date))
+            if unavailable is not None:
+                retry_at = datetime.fromisoformat(unavailable["retry_after"])
+            else:
+                retry_at = available_from(reporting_date)
+            if now >= retry_at:
+                due.append(reporting_date)
+        _LOGGER.debug("Downloading %s sales reports", len(due))
+        return reporting_dates, due
+
+    def record_ios_downloads(
+        self, due: list[dict[str, str]], errors: dict[str, BaseException]
+    ) -> None:
+        """Add the downloaded reports and remember when to retry the others."""
+        now = datetime.now(timezone.utc)
+        for reporting_date in due:
+            key = report_key(reporting_date)
+            if key not in errors:
+                self.report_files.add(ios_report_name(reporting_date))
+                self.ios_unavailable_cache.pop(key)
+                continue
+            attempts = self.ios_unavailable_cache.get(key, {}).get("attempts", 0) + 1
+            self.ios_unavailable_cache.set(
+                key,
+                {
+                    "reason": str(errors[key]),
+                    "attempts": attempts,
+                    "retry_after": retry_after(
+                        reporting_date, attempts, now
+                    ).isoformat(),
+                },
             )
+        self.ios_unavailable_cache.save()
+
+    def prune_ios_reports(self, reporting_dates: list[dict[str, str]]) -> None:
+        """Remove daily and weekly reports replaced by a monthly or yearly report."""
+        ingested = self.sales_store.report_keys()
+        for reporting_date in superseded_reports(
+            (parse_report_key(key) for key in ingested), reporting_dates, ingested
+        ):
+            _LOGGER.debug("Removing superseded report %s", report_key(reporting_date))
+            self.sales_store.remove_report(report_key(reporting_date))
+            self.report_files.remove(ios_report_name(reporting_date))
+
+    def ingest_ios_reports(
+        self,
+        reporting_dates: list[dict[str, str]],
+        due: list[dict[str, str]],
+        errors: dict[str, BaseException],
+    ) -> dict[str, dict[str, int]]:
+        """Parse the downloaded sales reports and return the installs per app.
+
+        Every report holds the sales of all apps of the vendor, the installs
+        of all configured apps are taken from the same reports. When a report
+        could not be downloaded or parsed, the first error is raised after the
+        other reports are stored, so the installs are not published without
+        that report. A report that Apple did not publish yet is not an error.
+        """
+        result: dict[str, dict[str, int]] = {
+            SENSOR_IOS_TOTAL_INSTALLS: {},
+        }
 
-            # only download new reports
-            if not os.path.isfile(file_path):
-                try:
-                    _LOGGER.debug("download report %s %s", frequency, report_date)
-                    api.download_sales_and_trends_reports(
-                        filters={
-                            "vendorNumber": "87483853",
-                            "frequency": frequency,
-                            "reportDate": report_date,
-                        },
-                        save_to=file_path,
-                    )
-                except Exception as err:
-                    _LOGGER.error(report_date)
-                    _LOGGER.error(err)
-
-            if os.path.isfile(file_path):
-                try:
-                    _df = pd.read_csv(file_path, sep="\t")
-                    _LOGGER.debug(_df.to_string())
-
-                    # bought app install and no app updates
-                    df_units = _df.loc[
-                        (_df["SKU"] == self.ios_bundle_id)
-                        & (
-                            _df["Product Type Identifier"].isin(
-                                product_identifiers_installs
-                            )
-                        )
-                    ]
-                    _LOGGER.debug(
-                        "total: %s, plus: %s",
-                        result[SENSOR_IOS_TOTAL_INSTALLS],
-                        df_units["Units"].sum(),
-                    )
-                    result[SENSOR_IOS_TOTAL_INSTALLS] = (
-                        result[SENSOR_IOS_TOTAL_INSTALLS] + df_units["Units"].sum()
-                    )
-                except Exception as err:
-                    _LOGGER.error(report_date)
-                    _LOGGER.error(err)
+        self.record_ios_downloads(due, errors)
+        failures = [
+            err
+            for err in errors.values()
+            if not (isinstance(err, AppStoreConnectError) and err.status == 404)
+        ]
+
+        # only parse reports that are not ingested yet
+        ingested = self.sales_store.report_keys()
+        to_parse = [
+            reporting_date
+            for reporting_date in reporting_dates
+            if report_key(reporting_date) not in ingested
+            and ios_report_name(reporting_date) in self.report_files
+        ]
+        parsed = self.parse_pool.parse(
+            [
+                self.report_files.file_path(ios_report_name(reporting_date))
+                for reporting_date in to_parse
+            ]
+        )
+        for reporting_date, rows in zip(to_parse, parsed):
+            name = ios_report_name(reporting_date)
+            try:
+                if isinstance(rows, CorruptReportError):
+                    # downloaded again on the next update
+                    self.report_files.remove(name)
+                if isinstance(rows, Exception):
+                    raise rows
+                self.report_files.mark_used(name)
+                self.sales_store.add_report(
+                    report_key(reporting_date),
+                    reporting_date["frequency"],
+                    reporting_date["reportDate"],
+                    rows,
+                )
+                self.metrics[SOURCE_APP_STORE].add(reports_parsed=1)
+            except Exception as err:
+                _LOGGER.error(reporting_date["reportDate"])
+                _LOGGER.error(err)
+                self.metrics[SOURCE_APP_STORE].add(errors=1)
+                failures.append(err)
+
+        self.prune_ios_reports(reporting_dates)
+
+        # reports that are no longer planned are not retried
+        planned = {report_key(reporting_date) for reporting_date in reporting_dates}
+        for key in list(self.ios_unavailable_cache.data):
+            if key not in planned:
+                self.ios_unavailable_cache.pop(key)
+        self.ios_unavailable_cache.save()
+
+        # reports whose rows are stored can be downloaded again when needed
+        ingested_names = {
+            ios_report_name(parse_report_key(key))
+            for key in self.sales_store.report_keys()
+        }
+        self.report_files.evict(lambda name: name in ingested_names)
+
+        if failures:
+            raise failures[0]
+
+        # a planned report that is not ingested yet is counted by the reports
+        # it replaces, so the total does not drop until it is ingested
+        units = self.sales_store.units(
+            (
+                report_key(reporting_date)
+                for reporting_date in ingested_cover(
+                    reporting_dates, self.sales_store.report_keys()
+                )
+            ),
+            INSTALL_PRODUCT_TYPES,
+        )
+        _LOGGER.debug(units)
+        result[SENSOR_IOS_TOTAL_INSTALLS] = {
+            ios_bundle_id: units.get(ios_bundle_id, 0)
+            for ios_bundle_id in self.ios_bundle_ids
+        }
 
         return result
 
-    def get_earnings_from_report(self, report: list[dict]) -> int:
-        """Remove headers and sort earnings."""
-        earnings = 0
-        del report[0]
-        del report[-1]
+    async def async_get_report_from_app_store_connect(
+        self,
+    ) -> dict[str, dict[str, int]]:
+        """Download sales reports from App Store Connect.
+
+        The reports are downloaded on the event loop, planning and parsing
+        run in the executor.
+        """
+        reporting_dates, due = await self.executor.async_add_job(self.due_ios_reports)
+        errors = await self.async_download_ios_reports(due)
+        return await self.executor.async_add_job(
+            self.ingest_ios_reports, reporting_dates, due, errors
+        )
+
+    def get_ios_install_history(self) -> dict[str, list[tuple[date, int]]]:
+        """Return the installs per app of every completed month or year.
+
+        Daily and weekly reports are left out, they are replaced by a monthly
+        report later. The history stops at the first month that is not
+        ingested yet, so an import of the history can be resumed later.
+        """
+        ingested = self.sales_store.report_keys()
+        report_keys = []
+        for reporting_date in sorted(
+            (
+                reporting_date
+                for reporting_date in self.ios_reporting_dates(REPORTS_START_DATE)
+                if reporting_date["frequency"] in (FREQUENCY_YEARLY, FREQUENCY_MONTHLY)
+            ),
+            key=lambda reporting_date: reporting_date["reportDate"],
+        ):
+            if report_key(reporting_date) not in ingested:
+                break
+            report_keys.append(report_key(reporting_date))
+
+        history: dict[str, list[tuple[date, int]]] = {
+            ios_bundle_id: [] for ios_bundle_id in self.ios_bundle_ids
+        }
+        for sku, begin_date, units in self.sales_store.units_per_period(
+            report_keys, INSTALL_PRODUCT_TYPES
+        ):
+            if sku in history:
+                history[sku].append((date.fromisoformat(begin_date), units))
+        return history
+
+    def get_play_install_history(self) -> dict[str, list[tuple[date, int]]]:
+        """Return the active installs per app of every day before today.
+
+        Overview reports of previous months that are not on disk yet are
+        downloaded, they do not change anymore.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from google.api_core.exceptions import NotFound
+
+        today = date.today()
+        bucket = self.get_storage_client().bucket(self.bucket_name)
+
+        history: dict[str, list[tuple[date, int]]] = {}
+        for play_bundle_id in self.play_bundle_ids:
+            history[play_bundle_id] = []
+            month = REPORTS_START_DATE.replace(day=1)
+            while month <= today:
+                source_blob_name = play_overview_blob_name(play_bundle_id, month)
+                name = "android/" + source_blob_name
+                month = (month + timedelta(days=32)).replace(day=1)
+
+                content = None
+                if name in self.report_files:
+                    try:
+                        content = self.report_files.read(name)
+                    except CorruptReportError as err:
+                        _LOGGER.warning(err)
+                if content is None:
+                    try:
+                        content = bucket.blob(
+                            "stats/installs/" + source_blob_name
+                        ).download_as_bytes()
+                    except NotFound:
+                        # the app did not exist yet
+                        continue
+                    self.report_files.write(name, content)
+
+                for day, active_installs in read_active_device_installs_history(
+                    content, play_bundle_id
+                ):
+                    if (day := date.fromisoformat(day)) < today:
+                        history[play_bundle_id].append((day, active_installs))
+
+        return history
+
+    def get_admob_earnings_history(self) -> list[tuple[date, float]]:
+        """Return the earnings of every settled day."""
+        with self._admob_lock:
+            return sorted(
+                (date.fromisoformat(day), earnings)
+                for day, earnings in self.admob_earnings_cache.data.items()
+            )
+
+    def get_daily_earnings_from_report(self, report: list[dict]) -> dict[date, float]:
+        """Sum the earnings per day of a report split by the DATE dimension."""
+        earnings: dict[date, float] = {}
+        # the first and last items are the header and footer of the report
         for _r in report:
-            earnings += round(
+            if "row" not in _r:
+                continue
+            day = datetime.strptime(
+                _r["row"]["dimensionValues"]["DATE"]["value"], "%Y%m%d"
+            ).date()
+            earnings[day] = earnings.get(day, 0) + round(
                 int(_r["row"]["metricValues"]["ESTIMATED_EARNINGS"]["microsValue"])
                 / 1000000,
                 2,
             )
         _LOGGER.debug(earnings)
-        if math.isnan(earnings):
-            return 0
         return earnings
 
+    def get_admob_service(self) -> Resource:
+        """Return the AdMob client, building it when the credentials changed."""
+        credentials_key = (
+            self.admob_credentials.refresh_token,
+            self.admob_credentials.client_id,
+        )
+        if (
+            self._admob_service is None
+            or self._admob_service_credentials != credentials_key
+        ):
+            _LOGGER.debug("Building AdMob client")
+            self._admob_service = build_admob_service(self.admob_credentials)
+            self._admob_service_credentials = credentials_key
+        return self._admob_service
+
     def get_admob_report(self) -> dict:
         """Get mediation report from AdMob."""
         result = {
@@ -272,53 +660,93 @@ class ReportApi:
         }
         today = date.today()
         first_day_of_month = date(today.year, today.month, 1)
-        last_day_of_month = date(
-            today.year, today.month, calendar.monthrange(today.year, today.month)[1]
-        )
 
-        try:
-            report_today = get_mediation_report(
-                self.admob_credentials,
-                self.admob_publisher_id,
-                today,
-                today,
+        # earnings of days before the settle window do not change anymore, only
+        # query the days from the first one that is not cached yet. The last
+        # days of the previous month settle during this month, they are cached
+        # for the history as well.
+        settled_before = today - timedelta(days=self.admob_settle_days)
+        cache_start = first_day_of_month - timedelta(days=self.admob_settle_days)
+
+        # The client and its connection are not thread safe, the cache is read
+        # by the history import
+        with self._admob_lock:
+            query_start = cache_start
+            while (
+                query_start < settled_before
+                and self.admob_earnings_cache.get(query_start.isoformat()) is not None
+            ):
+                query_start += timedelta(days=1)
+            self.metrics[SOURCE_ADMOB].add(
+                cache_hits=(query_start - cache_start).days,
+                cache_misses=(today - query_start).days + 1,
             )
-            report_month = get_mediation_report(
-                self.admob_credentials,
+
+            report = generate_mediation_report(
+                self.get_admob_service(),
                 self.admob_publisher_id,
-                first_day_of_month,
-                last_day_of_month,
-            )
-            _LOGGER.debug(report_today)
-            _LOGGER.debug(report_month)
-            result[SENSOR_ADMOB_REVENUE_TODAY] = self.get_earnings_from_report(
-                report=report_today
-            )
-            result[SENSOR_ADMOB_REVENUE_MONTH] = self.get_earnings_from_report(
-                report=report_month
+                query_start,
+                today,
+                by_date=True,
             )
-        except Exception as err:
-            _LOGGER.error(err)
+            _LOGGER.debug(report)
+            daily_earnings = self.get_daily_earnings_from_report(report)
+            self.metrics[SOURCE_ADMOB].add(reports_parsed=1)
+
+            day = cache_start
+            while day < settled_before:
+                if day < query_start:
+                    daily_earnings[day] = self.admob_earnings_cache.get(day.isoformat())
+                else:
+                    # days without any rows had no earnings
+                    daily_earnings.setdefault(day, 0)
+                    self.admob_earnings_cache.set(day.isoformat(), daily_earnings[day])
+                day += timedelta(days=1)
+            self.admob_earnings_cache.save()
+
+        daily_earnings = {
+            day: earnings
+            for day, earnings in daily_earnings.items()
+            if day >= first_day_of_month
+        }
+        result[SENSOR_ADMOB_REVENUE_TODAY] = round(daily_earnings.get(today, 0), 2)
+        result[SENSOR_ADMOB_REVENUE_MONTH] = round(sum(daily_earnings.values()), 2)
+        result[ADMOB_DAILY_EARNINGS] = {
+            day.isoformat(): earnings
+            for day, earnings in sorted(daily_earnings.items())
+        }
 
         return result
 
-    async def update_data(self) -> dict[str, Any]:
-        """Download reports from Google Play and App Store Connect."""
-        result = {}
-
-        admob_data = await self.hass.async_add_executor_job(self.get_admob_report)
-        result.update(admob_data)
-        _LOGGER.debug(admob_data)
-
-        android_data = await self.hass.async_add_executor_job(
-            self.get_report_from_bucket
-        )
-        result.update(android_data)
-        _LOGGER.debug(android_data)
-
-        ios_data = await self.hass.async_add_executor_job(
-            self.get_report_from_app_store_connect
-        )
-        result.update(ios_data)
-        _LOGGER.debug(ios_data)
-        return result
+    async def update_source(
+        self, source: str, previous: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Download the reports of a single source with its own timeout.
+
+        The previous data of the source is kept for the apps that can not be
+        updated.
+        """
+        jobs: dict[str, Callable[[], Awaitable[dict[str, Any]]]] = {
+            SOURCE_ADMOB: partial(self.executor.async_add_job, self.get_admob_report),
+            SOURCE_PLAY: partial(
+                self.executor.async_add_job, self.get_report_from_bucket, previous
+            ),
+            SOURCE_APP_STORE: self.async_get_report_from_app_store_connect,
+        }
+        metrics = self.metrics[source]
+        metrics.start_update()
+        start = time.monotonic()
+        try:
+            async with async_timeout.timeout(SOURCE_TIMEOUTS[source]):
+                data = await jobs[source]()
+        except Exception:
+            # failed reports and apps are counted where they fail, a failure
+            # of the update itself is counted here
+            if not metrics.errors:
+                metrics.add(errors=1)
+            raise
+        finally:
+            metrics.finish_update(time.monotonic() - start)
+            _LOGGER.debug("Updated %s: %s", source, metrics.as_dict())
+        _LOGGER.debug(data)
+        return data
@@ -0,0 +1,158 @@
+"""Asynchronous App Store Connect sales report client."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import BinaryIO
+
+import aiohttp
+import jwt
+
+from .executor import ReportExecutor
+
+_LOGGER = logging.getLogger(__name__)
+
+SALES_REPORTS_URL = "https://api.appstoreconnect.apple.com/v1/salesReports"
+
+# App Store Connect does not accept tokens that are valid for longer than
+# 20 minutes, a token is signed again a minute before it expires
+TOKEN_LIFETIME = 20 * 60
+TOKEN_REFRESH_MARGIN = 60
+
+# Seconds before a request to App Store Connect times out
+APP_STORE_REQUEST_TIMEOUT = 120
+
+CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class AppStoreConnectError(Exception):
+    """Error returned by App Store Connect."""
+
+    def __init__(self, status: int, detail: str) -> None:
+        """Init the error."""
+        super().__init__(f"{detail} (HTTP {status})")
+        self.status = status
+
+
+class AppStoreConnectClient:
+    """Download sales reports with the shared aiohttp session of Home Assistant.
+
+    The private key is read once and the signed token is reused until
+    shortly before it expires. Reports are saved gzip compressed, as they
+    are received, by the workers of the config entry.
+    """
+
+    def __init__(
+        self,
+        executor: ReportExecutor,
+        session: aiohttp.ClientSession,
+        key_id: str,
+        key_path: str,
+        issuer_id: str,
+        vendor_number: str,
+    ) -> None:
+        """Init App Store Connect client."""
+        self.executor = executor
+        self.session = session
+        self.key_id = key_id
+        self.key_path = key_path
+        self.issuer_id = issuer_id
+        self.vendor_number = vendor_number
+        self._key: str | None = None
+        self._token: str | None = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+
+    def _read_key(self) -> str:
+        """Read the private key."""
+        with open(self.key_path, encoding="utf-8") as file:
+            return file.read()
+
+    async def async_get_token(self) -> str:
+        """Return a signed token, signing a new one when it almost expired."""
+        async with self._token_lock:
+            now = time.time()
+            if self._token is None or now > self._token_expires - TOKEN_REFRESH_MARGIN:
+                if self._key is None:
+                    self._key = await self.executor.async_add_job(self._read_key)
+                expires = int(now) + TOKEN_LIFETIME
+                self._token = jwt.encode(
+                    {
+                        "iss": self.issuer_id,
+                        "exp": expires,
+                        "aud": "appstoreconnect-v1",
+                    },
+                    self._key,
+                    algorithm="ES256",
+                    headers={"kid": self.key_id, "typ": "JWT"},
+                )
+                self._token_expires = expires
+                _LOGGER.debug("Signed App Store Connect token")
+            return self._token
+
+    async def async_download_sales_report(
+        self, frequency: str, report_date: str, save_to: str
+    ) -> int:
+        """Download a gzip compressed sales report and return its size.
+
+        The report is written to a temporary file that replaces the
+        destination when the download is complete.
+        """
+        params = {
+            "filter[frequency]": frequency,
+            "filter[reportDate]": report_date,
+            "filter[reportSubType]": "SUMMARY",
+            "filter[reportType]": "SALES",
+            "filter[vendorNumber]": self.vendor_number,
+            "filter[version]": "1_0",
+        }
+        headers = {"Authorization": f"Bearer {await self.async_get_token()}"}
+        async with self.session.get(
+            SALES_REPORTS_URL,
+            params=params,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=APP_STORE_REQUEST_TIMEOUT),
+        ) as response:
+            if response.status != 200 or response.content_type != "application/a-gzip":
+                raise await self._async_error(response)
+
+            tmp_path = save_to + ".tmp"
+            file = await self.executor.async_add_job(open, tmp_path, "wb")
+            try:
+                size = await self._async_write_report(response, file)
+            except BaseException:
+                await self.executor.async_add_job(file.close)
+                await self.executor.async_add_job(os.remove, tmp_path)
+                raise
+            await self.executor.async_add_job(file.close)
+            await self.executor.async_add_job(os.replace, tmp_path, save_to)
+        return size
+
+    async def _async_write_report(
+        self, response: aiohttp.ClientResponse, file: BinaryIO
+    ) -> int:
+        """Write a response into a file."""
+        buffer = bytearray()
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                await self.executor.async_add_job(file.write, buffer)
+                size += len(buffer)
+                buffer = bytearray()
+        await self.executor.async_add_job(file.write, buffer)
+        return size + len(buffer)
+
+    @staticmethod
+    async def _async_error(response: aiohttp.ClientResponse) -> AppStoreConnectError:
+        """Return the error of a response."""
+        detail = response.reason or "Unknown error"
+        if response.content_type in ("application/json", "application/vnd.api+json"):
+            payload = await response.json(content_type=None)
+            if errors := payload.get("errors"):
+                detail = errors[0].get("detail", detail)
+        return AppStoreConnectError(response.status, detail)
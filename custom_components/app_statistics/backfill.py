@@ -0,0 +1,151 @@
+"""Import the history of the reports into the long-term statistics."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime
+import logging
+import os
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import CURRENCY_EURO
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .api import ReportApi
+from .const import DOMAIN
+from .report_cache import ReportCache
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistics imported per call to the recorder
+BACKFILL_CHUNK_SIZE = 500
+
+_BACKFILL_LOCK = asyncio.Lock()
+
+
+@dataclass
+class StatisticHistory:
+    """History of a single external statistic."""
+
+    metadata: StatisticMetaData
+    points: list[tuple[date, float]]
+
+
+def statistic_start(day: date) -> datetime:
+    """Return the start of the statistic of a day.
+
+    The recorder only accepts statistics that start on the hour in UTC, the
+    start of the local day is rounded down for time zones with a half or
+    quarter hour offset.
+    """
+    return dt_util.as_utc(dt_util.start_of_local_day(day)).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+
+def collect_history(api: ReportApi) -> list[StatisticHistory]:
+    """Collect the history of all reports of a config entry."""
+    histories: list[StatisticHistory] = []
+
+    for sku, points in api.get_ios_install_history().items():
+        histories.append(
+            StatisticHistory(
+                StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=f"{sku} iOS installs",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:ios_installs_{slugify(sku)}",
+                    unit_of_measurement="installs",
+                ),
+                points,
+            )
+        )
+
+    for package, points in api.get_play_install_history().items():
+        histories.append(
+            StatisticHistory(
+                StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=f"{package} Android active installs",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:android_active_installs_{slugify(package)}",
+                    unit_of_measurement="active installs",
+                ),
+                points,
+            )
+        )
+
+    histories.append(
+        StatisticHistory(
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=f"AdMob {api.admob_publisher_id} estimated revenue",
+                source=DOMAIN,
+                statistic_id=(
+                    f"{DOMAIN}:admob_estimated_revenue_"
+                    f"{slugify(api.admob_publisher_id)}"
+                ),
+                unit_of_measurement=CURRENCY_EURO,
+            ),
+            api.get_admob_earnings_history(),
+        )
+    )
+
+    return histories
+
+
+async def async_backfill_statistics(hass: HomeAssistant, api: ReportApi) -> None:
+    """Import the history of the reports as external statistics.
+
+    The history is imported in chunks, after every chunk the recorder is
+    allowed to catch up and a checkpoint with the last imported day and the
+    running sum is saved, so an interrupted import continues where it stopped.
+    """
+    async with _BACKFILL_LOCK:
+        histories = await api.executor.async_add_job(collect_history, api)
+
+        checkpoints = ReportCache(os.path.join(api.reports_path, "backfill.json"))
+        await api.executor.async_add_job(lambda: checkpoints.data)
+
+        for history in histories:
+            statistic_id = history.metadata["statistic_id"]
+            checkpoint = checkpoints.get(statistic_id, {})
+            total = checkpoint.get("sum", 0)
+            points = [
+                (day, value)
+                for day, value in history.points
+                if "last_start" not in checkpoint
+                or day.isoformat() > checkpoint["last_start"]
+            ]
+            _LOGGER.debug("Importing %s points of %s", len(points), statistic_id)
+
+            for index in range(0, len(points), BACKFILL_CHUNK_SIZE):
+                chunk = points[index : index + BACKFILL_CHUNK_SIZE]
+                statistics: list[StatisticData] = []
+                for day, value in chunk:
+                    start = statistic_start(day)
+                    if history.metadata["has_sum"]:
+                        total += value
+                        statistics.append(
+                            StatisticData(start=start, state=value, sum=total)
+                        )
+                    else:
+                        statistics.append(
+                            StatisticData(start=start, mean=value, min=value, max=value)
+                        )
+
+                async_add_external_statistics(hass, history.metadata, statistics)
+                await get_instance(hass).async_block_till_done()
+
+                checkpoints.set(
+                    statistic_id,
+                    {"last_start": chunk[-1][0].isoformat(), "sum": total},
+                )
+                await api.executor.async_add_job(checkpoints.save)
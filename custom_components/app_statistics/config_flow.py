@@ -7,28 +7,54 @@ from typing import Any, Mapping
 import voluptuous as vol
 from homeassistant.components import persistent_notification
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, OptionsFlow
+from homeassistant.core import callback
 
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_entry_oauth2_flow
 import homeassistant.helpers.config_validation as cv
-from googleapiclient.discovery import build
 import google.oauth2.credentials as gCredentials
 
 
+from .admob.generate_mediation_report import build_admob_service
+from .api import split_bundle_ids
 from .const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_ADMOB_CLIENT_ID,
+    CONF_ADMOB_SETTLE_DAYS,
+    CONF_ADMOB_UPDATE_INTERVAL,
+    CONF_APP_STORE_UPDATE_INTERVAL,
     CONF_ADMOB_PUBLISHER_ID,
     CONF_ADMOB_CLIENT_SECRET,
     CONF_BUCKET_NAME,
+    CONF_EXECUTOR_WORKERS,
     CONF_GOOGLE_ACCESS_TOKEN,
     CONF_IOS_BUNDLE_ID,
     CONF_IOS_CONNECT_ISSUER_ID,
     CONF_IOS_CONNECT_KEY_ID,
     CONF_IOS_CONNECT_KEY_PATH,
+    CONF_IOS_DOWNLOAD_WORKERS,
+    CONF_PARSE_PROCESSES,
     CONF_PLAY_BUNDLE_ID,
     CONF_PLAY_SERVICE_ACCOUNT_PATH,
+    CONF_PLAY_UPDATE_INTERVAL,
+    CONF_REPORT_CACHE_SIZE,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_ADMOB_SETTLE_DAYS,
+    DEFAULT_ADMOB_UPDATE_INTERVAL,
+    DEFAULT_APP_STORE_UPDATE_INTERVAL,
+    DEFAULT_EXECUTOR_WORKERS,
+    DEFAULT_IOS_DOWNLOAD_WORKERS,
+    DEFAULT_PARSE_PROCESSES,
+    DEFAULT_PLAY_UPDATE_INTERVAL,
+    DEFAULT_REPORT_CACHE_SIZE,
     DOMAIN,
+    MAX_EXECUTOR_WORKERS,
+    MAX_IOS_DOWNLOAD_WORKERS,
+    MAX_PARSE_PROCESSES,
+    MIN_REPORT_CACHE_SIZE,
+    MIN_UPDATE_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -84,6 +110,15 @@ async def validate_input(data: dict[str, str]) -> dict[str, str]:
     cv.isfile(data[CONF_PLAY_SERVICE_ACCOUNT_PATH])
     cv.isfile(data[CONF_IOS_CONNECT_KEY_PATH])
 
+    if not split_bundle_ids(data[CONF_IOS_BUNDLE_ID]) or not split_bundle_ids(
+        data[CONF_PLAY_BUNDLE_ID]
+    ):
+        raise InvalidBundleIds
+
+
+class InvalidBundleIds(HomeAssistantError):
+    """Error to indicate a bundle ID field holds no bundle IDs."""
+
 
 class AppStatisticsFlowHandler(
     config_entry_oauth2_flow.AbstractOAuth2FlowHandler, domain=DOMAIN
@@ -95,6 +130,12 @@ class AppStatisticsFlowHandler(
 
     reauth_entry: ConfigEntry | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     @property
     def logger(self) -> logging.Logger:
         """Return logger."""
@@ -131,9 +172,10 @@ class AppStatisticsFlowHandler(
             client_secret=self.reports_input[CONF_ADMOB_CLIENT_SECRET],
             enable_reauth_refresh=True,
         )
-        admob = build("admob", "v1", credentials=credentials)
-
         try:
+            admob = await self.hass.async_add_executor_job(
+                build_admob_service, credentials
+            )
             accounts = await self.hass.async_add_executor_job(
                 admob.accounts().list().execute
             )
@@ -171,6 +213,8 @@ class AppStatisticsFlowHandler(
 
         try:
             await validate_input(user_input)
+        except InvalidBundleIds:
+            errors["base"] = "invalid_bundle_ids"
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
@@ -221,3 +265,93 @@ class AppStatisticsFlowHandler(
             user_input={
                 "implementation": self.reauth_entry.data["auth_implementation"]}
         )
+
+
+class OptionsFlowHandler(OptionsFlow):
+    """Handle App Statistics options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_ADMOB_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_ADMOB_UPDATE_INTERVAL, DEFAULT_ADMOB_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_UPDATE_INTERVAL)),
+                    vol.Optional(
+                        CONF_ADMOB_SETTLE_DAYS,
+                        default=options.get(
+                            CONF_ADMOB_SETTLE_DAYS, DEFAULT_ADMOB_SETTLE_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=31)),
+                    vol.Optional(
+                        CONF_PLAY_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_PLAY_UPDATE_INTERVAL, DEFAULT_PLAY_UPDATE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_UPDATE_INTERVAL)),
+                    vol.Optional(
+                        CONF_APP_STORE_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_APP_STORE_UPDATE_INTERVAL,
+                            DEFAULT_APP_STORE_UPDATE_INTERVAL,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_UPDATE_INTERVAL)),
+                    vol.Optional(
+                        CONF_IOS_DOWNLOAD_WORKERS,
+                        default=options.get(
+                            CONF_IOS_DOWNLOAD_WORKERS, DEFAULT_IOS_DOWNLOAD_WORKERS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_IOS_DOWNLOAD_WORKERS),
+                    ),
+                    vol.Optional(
+                        CONF_EXECUTOR_WORKERS,
+                        default=options.get(
+                            CONF_EXECUTOR_WORKERS, DEFAULT_EXECUTOR_WORKERS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_EXECUTOR_WORKERS),
+                    ),
+                    vol.Optional(
+                        CONF_REPORT_CACHE_SIZE,
+                        default=options.get(
+                            CONF_REPORT_CACHE_SIZE, DEFAULT_REPORT_CACHE_SIZE
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=MIN_REPORT_CACHE_SIZE)
+                    ),
+                    vol.Optional(
+                        CONF_PARSE_PROCESSES,
+                        default=options.get(
+                            CONF_PARSE_PROCESSES, DEFAULT_PARSE_PROCESSES
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=0, max=MAX_PARSE_PROCESSES),
+                    ),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): bool,
+                }
+            ),
+        )
@@ -1,5 +1,7 @@
 """Constants for the App Statistics integration."""
 
+from datetime import date
+
 DOMAIN = "app_statistics"
 
 CONF_PLAY_SERVICE_ACCOUNT_PATH = "play_service_account_path"
@@ -15,7 +17,75 @@ CONF_ADMOB_PUBLISHER_ID = "admob_publisher_id"
 
 CONF_GOOGLE_ACCESS_TOKEN = "google_auth_access_token"
 
+# First day reports are downloaded for
+REPORTS_START_DATE = date(2021, 1, 1)
+
+CONF_IOS_DOWNLOAD_WORKERS = "ios_download_workers"
+
+# App Store Connect allows 3600 requests per hour, keep concurrent downloads low
+DEFAULT_IOS_DOWNLOAD_WORKERS = 4
+MAX_IOS_DOWNLOAD_WORKERS = 10
+
+# Worker threads for the blocking downloads and parsing of a config entry
+CONF_EXECUTOR_WORKERS = "executor_workers"
+DEFAULT_EXECUTOR_WORKERS = 3
+MAX_EXECUTOR_WORKERS = 10
+
+# Size of the downloaded raw reports in MiB
+CONF_REPORT_CACHE_SIZE = "report_cache_size"
+DEFAULT_REPORT_CACHE_SIZE = 100
+MIN_REPORT_CACHE_SIZE = 1
+
+# Poll around the publish times of the sources instead of at a fixed interval
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = True
+
+# Worker processes that parse the sales reports, 0 parses them in a thread
+CONF_PARSE_PROCESSES = "parse_processes"
+DEFAULT_PARSE_PROCESSES = 0
+MAX_PARSE_PROCESSES = 4
+
+# Days after which AdMob earnings of a day are considered final
+CONF_ADMOB_SETTLE_DAYS = "admob_settle_days"
+DEFAULT_ADMOB_SETTLE_DAYS = 3
+
+# Update intervals in minutes
+CONF_ADMOB_UPDATE_INTERVAL = "admob_update_interval"
+CONF_PLAY_UPDATE_INTERVAL = "play_update_interval"
+CONF_APP_STORE_UPDATE_INTERVAL = "app_store_update_interval"
+DEFAULT_ADMOB_UPDATE_INTERVAL = 15
+DEFAULT_PLAY_UPDATE_INTERVAL = 360
+DEFAULT_APP_STORE_UPDATE_INTERVAL = 360
+MIN_UPDATE_INTERVAL = 5
+
+SOURCE_ADMOB = "admob"
+SOURCE_PLAY = "play"
+SOURCE_APP_STORE = "app_store"
+SOURCES = (SOURCE_ADMOB, SOURCE_PLAY, SOURCE_APP_STORE)
+
+# Seconds a single source may take before its update is abandoned
+SOURCE_TIMEOUTS = {
+    SOURCE_ADMOB: 60,
+    SOURCE_PLAY: 120,
+    SOURCE_APP_STORE: 600,
+}
+
 SENSOR_IOS_TOTAL_INSTALLS = "ios_app_install_total"
 SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS = "android_app_current_active_installs"
 SENSOR_ADMOB_REVENUE_TODAY = "admob_estimated_revenue_today"
 SENSOR_ADMOB_REVENUE_MONTH = "admob_estimated_revenue_month"
+
+# Estimated AdMob earnings per day of the current month
+ADMOB_DAILY_EARNINGS = "admob_daily_earnings"
+
+SERVICE_BACKFILL_STATISTICS = "backfill_statistics"
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_SOURCE = "source"
+
+# Running statistics imports per config entry, cancelled when it is unloaded
+DATA_BACKFILL_TASKS = f"{DOMAIN}_backfill_tasks"
+
+# Seconds between refreshes that are requested with the refresh service,
+# requests in between are merged into one refresh at the end of the cooldown
+REFRESH_COOLDOWN = 60
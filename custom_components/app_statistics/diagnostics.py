@@ -0,0 +1,63 @@
+"""Diagnostics support for App Statistics."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ADMOB_CLIENT_ID,
+    CONF_ADMOB_CLIENT_SECRET,
+    CONF_ADMOB_PUBLISHER_ID,
+    CONF_IOS_CONNECT_ISSUER_ID,
+    CONF_IOS_CONNECT_KEY_ID,
+    DOMAIN,
+)
+from .report_coordinator import ReportCoordinator
+
+TO_REDACT = {
+    CONF_ADMOB_CLIENT_ID,
+    CONF_ADMOB_CLIENT_SECRET,
+    CONF_ADMOB_PUBLISHER_ID,
+    CONF_IOS_CONNECT_ISSUER_ID,
+    CONF_IOS_CONNECT_KEY_ID,
+    "google_credentials",
+    "token",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinators: dict[str, ReportCoordinator] = hass.data[DOMAIN][entry.entry_id]
+    api = next(iter(coordinators.values())).api
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "sources": {
+            source: {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": (
+                    coordinator.update_interval.total_seconds()
+                    if coordinator.update_interval
+                    else None
+                ),
+                "last_change": (
+                    coordinator.poll_schedule.last_change.isoformat()
+                    if coordinator.poll_schedule
+                    and coordinator.poll_schedule.last_change
+                    else None
+                ),
+                "metrics": api.metrics[source].as_dict(),
+            }
+            for source, coordinator in coordinators.items()
+        },
+        "executor": api.executor.stats(),
+    }
@@ -0,0 +1,87 @@
+"""Worker pool for the blocking report jobs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Any, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class ReportExecutor:
+    """Bounded thread pool that runs the blocking jobs of a config entry.
+
+    Downloads and parsing of a config entry run on their own workers, so a
+    long backfill does not take the threads of the shared executor of Home
+    Assistant. The queue depth and the jobs that had to wait for a worker
+    are counted to help choose the pool size.
+    """
+
+    def __init__(self, max_workers: int, name: str) -> None:
+        """Init report executor."""
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.jobs = 0
+        self.waited_jobs = 0
+        self.wait_time = 0.0
+
+    async def async_add_job(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run a blocking job on the pool."""
+        submitted = time.monotonic()
+        with self._lock:
+            self.queued += 1
+            self.jobs += 1
+            # jobs that wait for a worker because all workers are busy
+            waiting = self.queued + self.running - self.max_workers
+            if waiting > 0:
+                self.waited_jobs += 1
+                self.peak_queued = max(self.peak_queued, waiting)
+
+        def run() -> _T:
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.wait_time += time.monotonic() - submitted
+            try:
+                return target(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, run)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the queue depth and saturation of the pool."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": self.queued,
+                "peak_queue_depth": self.peak_queued,
+                "jobs": self.jobs,
+                "waited_jobs": self.waited_jobs,
+                "saturation": (
+                    round(self.waited_jobs / self.jobs, 3) if self.jobs else 0.0
+                ),
+                "average_wait": (
+                    round(self.wait_time / self.jobs, 3) if self.jobs else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        """Wait for the running jobs and stop the workers."""
+        _LOGGER.debug("Shutting down report executor: %s", self.stats())
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,65 @@
+"""Performance metrics of the report updates."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+import threading
+from typing import Any
+
+# counters that describe a single update, reset when an update starts
+UPDATE_COUNTERS = (
+    "bytes_downloaded",
+    "reports_parsed",
+    "cache_hits",
+    "cache_misses",
+    "errors",
+)
+
+
+@dataclass
+class SourceMetrics:
+    """Metrics of the updates of a single source.
+
+    The counters are increased from executor jobs and download threads, so
+    they are changed with a lock.
+    """
+
+    last_duration: float | None = None
+    bytes_downloaded: int = 0
+    reports_parsed: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    errors: int = 0
+    updates: int = 0
+    total_errors: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def start_update(self) -> None:
+        """Reset the counters of a single update."""
+        with self._lock:
+            for counter in UPDATE_COUNTERS:
+                setattr(self, counter, 0)
+
+    def finish_update(self, duration: float) -> None:
+        """Record the wall time of an update."""
+        with self._lock:
+            self.last_duration = round(duration, 3)
+            self.updates += 1
+
+    def add(self, **counters: int) -> None:
+        """Increase counters of the current update."""
+        with self._lock:
+            for counter, value in counters.items():
+                setattr(self, counter, getattr(self, counter) + value)
+            self.total_errors += counters.get("errors", 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a dictionary."""
+        with self._lock:
+            return {
+                metric.name: getattr(self, metric.name)
+                for metric in fields(self)
+                if not metric.name.startswith("_")
+            }
@@ -0,0 +1,87 @@
+"""Process pool that parses the downloaded sales reports."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+import os
+import runpy
+import threading
+
+from .sales_report import read_sales_report_file
+
+_LOGGER = logging.getLogger(__name__)
+
+SalesRows = list[tuple[str, str, str, str, str, int]]
+
+# run by every worker before the parser is imported, see parse_worker
+WORKER_SETUP = os.path.join(os.path.dirname(__file__), "parse_worker.py")
+
+
+class ReportParsePool:
+    """Parse sales reports in worker processes.
+
+    Parsing a large report holds the GIL of the Home Assistant process for a
+    long time. With worker processes every worker reads and parses a report
+    and only the grouped rows are sent back. Without workers the reports are
+    parsed in the calling thread, which is cheaper for small installs. The
+    workers are started on the first parse and kept until shutdown, and
+    import only the parser, not Home Assistant.
+    """
+
+    def __init__(self, processes: int) -> None:
+        """Init report parse pool."""
+        self.processes = processes
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the worker processes, starting them when needed."""
+        with self._lock:
+            if self._executor is None:
+                _LOGGER.debug("Starting %s report parse processes", self.processes)
+                # forking a process with running threads can deadlock the child
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=runpy.run_path,
+                    initargs=(WORKER_SETUP,),
+                )
+            return self._executor
+
+    def parse(self, file_paths: list[str]) -> list[SalesRows | Exception]:
+        """Return the grouped rows or the error of every report file."""
+        if not self.processes:
+            results: list[SalesRows | Exception] = []
+            for file_path in file_paths:
+                try:
+                    results.append(read_sales_report_file(file_path))
+                except Exception as err:  # pylint: disable=broad-except
+                    results.append(err)
+            return results
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(read_sales_report_file, file_path)
+            for file_path in file_paths
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as err:  # pylint: disable=broad-except
+                results.append(err)
+        if any(isinstance(result, BrokenProcessPool) for result in results):
+            # a worker died, new workers are started for the next parse
+            _LOGGER.warning("A report parse process stopped unexpectedly")
+            self.shutdown()
+        return results
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,31 @@
+"""Set up a report parse process without importing Home Assistant.
+
+Every worker process runs this file as a script before it parses a report.
+The parser is sent to the worker by its module path, and importing it would
+run the __init__ of the integration, which imports Home Assistant and the API
+clients. The integration package is registered with only its path instead,
+so just the parser modules are imported.
+"""
+
+import os
+import sys
+import types
+
+PACKAGE = "custom_components.app_statistics"
+
+
+def register_package() -> None:
+    """Register the integration package without running its __init__."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    for name, package_path in (
+        ("custom_components", os.path.dirname(path)),
+        (PACKAGE, path),
+    ):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [package_path]
+            sys.modules[name] = package
+
+
+# a no-op when imported as part of the integration, which is registered then
+register_package()
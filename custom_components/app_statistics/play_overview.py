@@ -0,0 +1,71 @@
+"""Read Google Play installs overview reports."""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import IO
+
+
+def read_latest_overview_row(
+    file: IO[str], package_name: str, columns: list[str]
+) -> dict[str, str] | None:
+    """Return the last row of a package in an installs overview report.
+
+    The report is read row by row and only the requested columns of the last
+    matching row are kept, so memory use does not depend on the report size.
+    """
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return None
+
+    package_index = header.index("Package Name")
+    column_indexes = [header.index(column) for column in columns]
+
+    latest: list[str] | None = None
+    for row in reader:
+        if len(row) > package_index and row[package_index] == package_name:
+            latest = row
+
+    if latest is None:
+        return None
+    return {column: latest[index] for column, index in zip(columns, column_indexes)}
+
+
+def _open_report(report: bytes) -> IO[str]:
+    """Return the text of a report."""
+    # the overview reports are UTF-16 encoded, the text layer decodes the
+    # report incrementally while it is read
+    return io.TextIOWrapper(io.BytesIO(report), encoding="utf-16", newline="")
+
+
+def read_active_device_installs(report: bytes, package_name: str) -> int | None:
+    """Return the latest active device installs of a package."""
+    with _open_report(report) as file:
+        row = read_latest_overview_row(file, package_name, ["Active Device Installs"])
+
+    if row is None:
+        return None
+    return int(row["Active Device Installs"])
+
+
+def read_active_device_installs_history(
+    report: bytes, package_name: str
+) -> list[tuple[str, int]]:
+    """Return the active device installs of a package for every day in a report."""
+    history: list[tuple[str, int]] = []
+    with _open_report(report) as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return history
+
+        package_index = header.index("Package Name")
+        date_index = header.index("Date")
+        installs_index = header.index("Active Device Installs")
+        for row in reader:
+            if len(row) > package_index and row[package_index] == package_name:
+                history.append((row[date_index], int(row[installs_index])))
+
+    return history
@@ -0,0 +1,110 @@
+"""Choose when the reports of a source are polled again."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from .const import SOURCE_APP_STORE, SOURCE_PLAY
+from .report_planner import REPORT_AVAILABILITY_TIME
+
+# Polls around a publish start this long before the expected publish time
+PUBLISH_WINDOW_BEFORE = timedelta(minutes=30)
+
+# Wait between polls at the start of a publish window
+PUBLISH_POLL_INTERVAL = timedelta(minutes=15)
+
+# Longest wait between polls, also when a publish is late
+MAX_POLL_INTERVAL = timedelta(hours=12)
+
+# Without new data, a quarter of the time since the data changed or since the
+# publish was expected is waited
+BACKOFF_FACTOR = 4
+
+
+@dataclass
+class PollSchedule:
+    """Adaptive wait between the polls of a source.
+
+    A source with a daily publish time is polled every publish interval from
+    shortly before the expected publish until its data changed, and then not
+    until the window of the next publish. The publish time is fixed or learned
+    from the time the data last changed. A source without a publish time is
+    polled less often the longer its data did not change, starting at the
+    interval. A late publish backs off the same way.
+    """
+
+    interval: timedelta
+    publish_interval: timedelta = PUBLISH_POLL_INTERVAL
+    publish_time: time | None = None
+    learn_publish_time: bool = False
+    last_change: datetime | None = None
+
+    @staticmethod
+    def _backoff(elapsed: timedelta, interval: timedelta) -> timedelta:
+        """Return the wait after a time without new data."""
+        return min(max(elapsed / BACKOFF_FACTOR, interval), MAX_POLL_INTERVAL)
+
+    def next_interval(self, now: datetime, changed: bool) -> timedelta:
+        """Return the wait until the next poll after a poll at a time."""
+        if changed:
+            self.last_change = now
+            if self.learn_publish_time:
+                self.publish_time = now.timetz()
+
+        if self.publish_time is None:
+            return self._backoff(
+                now - self.last_change if self.last_change else timedelta(0),
+                self.interval,
+            )
+
+        # the last publish whose window started
+        expected = datetime.combine(now.date(), self.publish_time)
+        if now < expected - PUBLISH_WINDOW_BEFORE:
+            expected -= timedelta(days=1)
+        next_window = expected + timedelta(days=1) - PUBLISH_WINDOW_BEFORE
+
+        if (
+            self.last_change is not None
+            and self.last_change >= expected - PUBLISH_WINDOW_BEFORE
+        ):
+            # the data of the last publish is in, wait for the next window
+            wait = next_window - now
+        else:
+            wait = self._backoff(now - expected, self.publish_interval)
+        return min(wait, next_window - now, MAX_POLL_INTERVAL)
+
+    def as_dict(self) -> dict[str, str | None]:
+        """Return the state that is saved with the last known data."""
+        return {
+            "last_change": self.last_change.isoformat() if self.last_change else None,
+            "publish_time": (
+                self.publish_time.isoformat()
+                if self.learn_publish_time and self.publish_time
+                else None
+            ),
+        }
+
+    def restore(self, state: dict[str, str | None]) -> None:
+        """Restore the state saved with the last known data."""
+        if last_change := state.get("last_change"):
+            self.last_change = datetime.fromisoformat(last_change)
+        if self.learn_publish_time and (publish_time := state.get("publish_time")):
+            self.publish_time = time.fromisoformat(publish_time)
+
+
+def source_poll_schedule(source: str, update_interval: timedelta) -> PollSchedule:
+    """Return the poll schedule of a source with a configured update interval.
+
+    Apple publishes the sales reports of a day at a known time, the Play
+    overview is updated once a day at a time that is learned. AdMob estimates
+    change during the day and have no publish time.
+    """
+    publish_interval = min(update_interval, PUBLISH_POLL_INTERVAL)
+    if source == SOURCE_APP_STORE:
+        return PollSchedule(
+            update_interval, publish_interval, publish_time=REPORT_AVAILABILITY_TIME
+        )
+    if source == SOURCE_PLAY:
+        return PollSchedule(update_interval, publish_interval, learn_publish_time=True)
+    return PollSchedule(update_interval, publish_interval)
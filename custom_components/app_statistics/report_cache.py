@@ -0,0 +1,70 @@
+"""Persisted caches for downloaded reports."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """Small JSON backed key/value cache stored next to the downloaded reports.
+
+    The cache is used from executor jobs, so it uses blocking file io. It is
+    loaded on first access and only written when something changed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Init report cache."""
+        self.path = path
+        self._data: dict[str, Any] | None = None
+        self._dirty = False
+
+    @property
+    def data(self) -> dict[str, Any]:
+        """Return the cached data, loading it from disk if needed."""
+        if self._data is None:
+            self._data = self._load()
+        return self._data
+
+    def _load(self) -> dict[str, Any]:
+        """Load the cache file."""
+        if not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Discarding unreadable cache %s: %s", self.path, err)
+            return {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value."""
+        return self.data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a cached value."""
+        if self.data.get(key) != value:
+            self.data[key] = value
+            self._dirty = True
+
+    def pop(self, key: str) -> Any:
+        """Remove a cached value."""
+        if key not in self.data:
+            return None
+        self._dirty = True
+        return self.data.pop(key)
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.data, file)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -1,66 +1,142 @@
 """Download reports from App Storen Connect and Play Console."""
 
+import asyncio
 from datetime import timedelta
 import logging
 from typing import Any
-import google.oauth2.credentials
 
 
 from .api import ReportApi
-from .const import DOMAIN
-from homeassistant.core import HomeAssistant
+from .const import DOMAIN, REFRESH_COOLDOWN
+from .poll_schedule import PollSchedule
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str, source: str) -> Store:
+    """Return the store with the last known data of a source and its schedule."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.{source}")
+
 
 class ReportCoordinator(DataUpdateCoordinator):
-    """My custom coordinator."""
+    """Coordinate the reports of a single source."""
 
     def __init__(
         self,
         hass: HomeAssistant,
-        play_service_account_path: str,
-        bucket_name: str,
-        play_bundle_id: str,
-        ios_bundle_id: str,
-        ios_key_id: str,
-        ios_key_path: str,
-        ios_issuer_id: str,
-        admob_publisher_id: str,
-        admob_credentials: google.oauth2.credentials.Credentials,
+        api: ReportApi,
+        source: str,
+        update_interval: timedelta,
+        entry_id: str,
+        poll_schedule: PollSchedule | None = None,
     ) -> None:
         """Initialize my coordinator."""
-        self.api = ReportApi(
-            hass=hass,
-            play_service_account_path=play_service_account_path,
-            bucket_name=bucket_name,
-            play_bundle_id=play_bundle_id,
-            ios_bundle_id=ios_bundle_id,
-            ios_key_id=ios_key_id,
-            ios_key_path=ios_key_path,
-            ios_issuer_id=ios_issuer_id,
-            admob_publisher_id=admob_publisher_id,
-            admob_credentials=admob_credentials
-        )
+        self.api = api
+        self.source = source
+        self.poll_schedule = poll_schedule
+        self._store = snapshot_store(hass, entry_id, source)
+        self._update_task: asyncio.Task[dict[str, Any]] | None = None
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
 
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(hours=1),
+            name=f"{DOMAIN}_{source}",
+            update_interval=update_interval,
+            # requested refreshes run right away, repeated requests are merged
+            # into one refresh per cooldown
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REFRESH_COOLDOWN, immediate=True
+            ),
         )
 
+    async def async_load_snapshot(self) -> None:
+        """Load the last known data, so sensors have a value before a refresh.
+
+        The poll schedule continues from the last change before the restart.
+        """
+        if (snapshot := await self._store.async_load()) is not None:
+            _LOGGER.debug("Loaded %s snapshot", self.source)
+            self.data = snapshot["data"]
+            if self.poll_schedule is not None:
+                self.poll_schedule.restore(snapshot["schedule"])
+
+    def _snapshot(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return the data and poll schedule state to save."""
+        return {
+            "data": data,
+            "schedule": self.poll_schedule.as_dict() if self.poll_schedule else {},
+        }
+
+    @callback
+    def async_start_refresh(self) -> None:
+        """Refresh in the background, the refresh is cancelled on shutdown."""
+        task = self.hass.async_create_task(self.async_refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing and cancel the running update.
+
+        Called before the API is closed, so no update starts a job on the
+        workers or opens the sales store again.
+        """
+        if hasattr(DataUpdateCoordinator, "async_shutdown"):
+            # newer Home Assistant versions also stop late listeners from
+            # scheduling a refresh
+            await super().async_shutdown()
+        else:
+            self._debounced_refresh.async_cancel()
+            if self._unsub_refresh:
+                self._unsub_refresh()
+                self._unsub_refresh = None
+
+        tasks = [task for task in self._refresh_tasks if not task.done()]
+        if self._update_task is not None and not self._update_task.done():
+            tasks.append(self._update_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data, sharing an update that is already running."""
+        if self._update_task is None or self._update_task.done():
+            self._update_task = self.hass.async_create_task(self._async_fetch_data())
+        else:
+            _LOGGER.debug("Joining running %s update", self.source)
+        return await asyncio.shield(self._update_task)
+
+    async def _async_fetch_data(self) -> dict[str, Any]:
         """Fetch data from API endpoint.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
         try:
-            data = await self.api.update_data()
+            data = await self.api.update_source(self.source, self.data)
             logging.debug(data)
-            return data
+        except asyncio.TimeoutError as err:
+            raise UpdateFailed(f"Timeout fetching {self.source} reports") from err
         except Exception as err:
             logging.error(err)
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        if self.poll_schedule is not None:
+            # without previous data it is not known when the data changed
+            changed = self.data is not None and data != self.data
+            # the next refresh is scheduled with the interval after the update
+            self.update_interval = self.poll_schedule.next_interval(
+                dt_util.utcnow(), changed
+            )
+            _LOGGER.debug("Next %s update in %s", self.source, self.update_interval)
+
+        self._store.async_delay_save(lambda: self._snapshot(data), SNAPSHOT_SAVE_DELAY)
+        return data
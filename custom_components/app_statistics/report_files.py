@@ -0,0 +1,204 @@
+"""Size bounded directory with the downloaded raw reports."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import gzip
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import IO
+import zlib
+
+from .report_cache import ReportCache
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILE = "files.json"
+
+
+class CorruptReportError(Exception):
+    """Raised when a stored report can not be read back."""
+
+
+@contextmanager
+def open_report_file(file_path: str) -> Iterator[IO[bytes]]:
+    """Open a report file to read it decompressed as a stream.
+
+    CorruptReportError is raised when the file can not be read or fails the
+    gzip checksum, which is checked when the end of the file is read.
+    """
+    try:
+        with gzip.open(file_path, "rb") as file:
+            yield file
+    except (OSError, EOFError, zlib.error) as err:
+        raise CorruptReportError(f"Corrupt report {file_path}: {err}") from err
+
+
+def read_report_file(file_path: str) -> bytes:
+    """Return the decompressed content of a report file."""
+    with open_report_file(file_path) as file:
+        return file.read()
+
+
+class ReportFiles:
+    """Gzip compressed raw reports with a size budget.
+
+    Every report is written to a temporary file that replaces the report when
+    it is complete, and decompressed completely when it is read, so a
+    truncated or corrupt report fails the gzip checksum instead of being
+    parsed. The size and last use of every report are kept in an index. When
+    the reports take more than the budget, the least recently used reports
+    whose aggregates are stored elsewhere are removed. The files are used
+    from executor jobs, access is serialised with a lock.
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        """Init report files."""
+        self.path = path
+        self.max_size = max_size
+        self._index = ReportCache(os.path.join(path, INDEX_FILE))
+        self._lock = threading.RLock()
+        self._scanned = False
+
+    def file_path(self, name: str) -> str:
+        """Return the path of a report."""
+        return os.path.join(self.path, name + ".gz")
+
+    def _scan(self) -> None:
+        """Match the index with the reports on disk, compressing legacy reports."""
+        if self._scanned:
+            return
+        self._scanned = True
+        for name in list(self._index.data):
+            if not os.path.isfile(self.file_path(name)):
+                self._index.pop(name)
+
+        for directory, _, file_names in os.walk(self.path):
+            for file_name in file_names:
+                file_path = os.path.join(directory, file_name)
+                name = os.path.relpath(file_path, self.path)
+                if file_name.endswith(".gz"):
+                    if name[:-3] not in self._index.data:
+                        self._index.set(
+                            name[:-3],
+                            {
+                                "size": os.path.getsize(file_path),
+                                "used": os.path.getmtime(file_path),
+                            },
+                        )
+                elif file_name.endswith(".csv"):
+                    # reports downloaded before they were stored compressed
+                    _LOGGER.debug("Compressing report %s", name)
+                    with open(file_path, "rb") as file:
+                        self.write(name, file.read())
+                    os.remove(file_path)
+        self._index.save()
+
+    def _touch(self, name: str, size: int) -> None:
+        """Record the size and last use of a report."""
+        self._index.set(name, {"size": size, "used": time.time()})
+
+    def __contains__(self, name: str) -> bool:
+        """Return if a report is stored."""
+        with self._lock:
+            self._scan()
+            return name in self._index.data
+
+    def write(self, name: str, content: bytes) -> None:
+        """Compress and store a report."""
+        file_path = self.file_path(name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(gzip.compress(content))
+        os.replace(tmp_path, file_path)
+        self.add(name)
+
+    def add(self, name: str) -> None:
+        """Add a report that was written to its path."""
+        with self._lock:
+            self._scan()
+            self._touch(name, os.path.getsize(self.file_path(name)))
+            self._index.save()
+
+    def read(self, name: str) -> bytes:
+        """Return the decompressed content of a report.
+
+        A report that fails its checksum is removed and CorruptReportError is
+        raised, so it is downloaded again.
+        """
+        with self._lock:
+            self._scan()
+            try:
+                content = read_report_file(self.file_path(name))
+            except CorruptReportError:
+                self.remove(name)
+                raise
+            self.mark_used(name)
+            return content
+
+    def mark_used(self, name: str) -> None:
+        """Record that a report was read outside of the index."""
+        with self._lock:
+            self._touch(name, self._index.get(name, {}).get("size", 0))
+            self._index.save()
+
+    def remove(self, name: str) -> None:
+        """Remove a report."""
+        with self._lock:
+            try:
+                os.remove(self.file_path(name))
+            except FileNotFoundError:
+                pass
+            self._index.pop(name)
+            self._index.save()
+
+    def size(self) -> int:
+        """Return the size of all reports."""
+        with self._lock:
+            self._scan()
+            return sum(entry["size"] for entry in self._index.data.values())
+
+    def evict(self, is_evictable: Callable[[str], bool]) -> list[str]:
+        """Remove the least recently used reports until they fit the budget.
+
+        Only reports whose aggregates are stored elsewhere are evictable,
+        reports that would have to be downloaded again are kept.
+        """
+        with self._lock:
+            self._scan()
+            size = self.size()
+            evicted: list[str] = []
+            for name, entry in sorted(
+                self._index.data.items(), key=lambda item: item[1]["used"]
+            ):
+                if size <= self.max_size:
+                    break
+                if not is_evictable(name):
+                    continue
+                size -= entry["size"]
+                evicted.append(name)
+            for name in evicted:
+                self.remove(name)
+            if evicted:
+                _LOGGER.debug("Evicted %s reports, %s bytes left", len(evicted), size)
+            return evicted
+
+
+def migrate_report_directory(legacy_path: str, path: str) -> None:
+    """Move reports from the working directory to the configuration directory."""
+    legacy_path = os.path.abspath(legacy_path)
+    if legacy_path == os.path.abspath(path) or not os.path.isdir(legacy_path):
+        return
+    if os.path.exists(path):
+        _LOGGER.warning(
+            "Not moving reports from %s, %s already exists", legacy_path, path
+        )
+        return
+    _LOGGER.info("Moving reports from %s to %s", legacy_path, path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    shutil.move(legacy_path, path)
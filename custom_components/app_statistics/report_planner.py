@@ -0,0 +1,230 @@
+"""Plan the App Store Connect sales reports that cover a date range."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import calendar
+from datetime import date, datetime, time, timedelta, timezone
+
+FREQUENCY_DAILY = "DAILY"
+FREQUENCY_WEEKLY = "WEEKLY"
+FREQUENCY_MONTHLY = "MONTHLY"
+FREQUENCY_YEARLY = "YEARLY"
+
+# Days after the last day of a period before Apple publishes its report
+REPORT_AVAILABILITY_DELAY = {
+    FREQUENCY_DAILY: 1,
+    FREQUENCY_WEEKLY: 2,
+    FREQUENCY_MONTHLY: 5,
+    FREQUENCY_YEARLY: 6,
+}
+
+# Apple publishes the reports of a day in the morning Pacific time
+REPORT_AVAILABILITY_TIME = time(13, tzinfo=timezone.utc)
+
+# Wait between downloads of a report that is not available, doubled after
+# every failed attempt
+RETRY_BACKOFF_MIN = timedelta(minutes=30)
+RETRY_BACKOFF_MAX = timedelta(days=1)
+
+REPORT_DATE_FORMATS = {
+    FREQUENCY_DAILY: "%Y-%m-%d",
+    # weekly reports are identified by the Sunday the week ends on
+    FREQUENCY_WEEKLY: "%Y-%m-%d",
+    FREQUENCY_MONTHLY: "%Y-%m",
+    FREQUENCY_YEARLY: "%Y",
+}
+
+
+def _available_from(frequency: str, period_end: date) -> datetime:
+    """Return the time the report of a period ending on a day is published."""
+    return datetime.combine(
+        period_end + timedelta(days=REPORT_AVAILABILITY_DELAY[frequency]),
+        REPORT_AVAILABILITY_TIME,
+    )
+
+
+def is_available(frequency: str, period_end: date, now: datetime) -> bool:
+    """Return if the report of a period ending on a day is available at a time."""
+    return now >= _available_from(frequency, period_end)
+
+
+def _reporting_date(frequency: str, period_end: date) -> dict[str, str]:
+    """Return the reporting date of the report of a period."""
+    return {
+        "frequency": frequency,
+        "reportDate": period_end.strftime(REPORT_DATE_FORMATS[frequency]),
+    }
+
+
+def report_period(reporting_date: dict[str, str]) -> tuple[date, date]:
+    """Return the first and last day covered by a report."""
+    frequency = reporting_date["frequency"]
+    report_date = reporting_date["reportDate"]
+    if frequency == FREQUENCY_YEARLY:
+        year = int(report_date)
+        return date(year, 1, 1), date(year, 12, 31)
+    if frequency == FREQUENCY_MONTHLY:
+        year, month = (int(part) for part in report_date.split("-"))
+        return date(year, month, 1), date(
+            year, month, calendar.monthrange(year, month)[1]
+        )
+    day = date.fromisoformat(report_date)
+    if frequency == FREQUENCY_WEEKLY:
+        return day - timedelta(days=6), day
+    return day, day
+
+
+def available_from(reporting_date: dict[str, str]) -> datetime:
+    """Return the time from which a report is expected to be available."""
+    _, end = report_period(reporting_date)
+    return _available_from(reporting_date["frequency"], end)
+
+
+def retry_after(
+    reporting_date: dict[str, str], attempts: int, now: datetime
+) -> datetime:
+    """Return when to download a report again after a number of failed attempts.
+
+    The wait doubles with every attempt, but a report is never requested
+    before Apple is expected to publish it.
+    """
+    backoff = min(RETRY_BACKOFF_MIN * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+    return max(now + backoff, available_from(reporting_date))
+
+
+def plan_reports(start_date: date, now: datetime) -> list[dict[str, str]]:
+    """Return the fewest available reports covering start date until a time.
+
+    Every day from the start date until the last day whose daily report is
+    available is covered by exactly one report. From the start date on, the
+    longest period that starts on the current day and whose report is
+    available is taken: a year, a month, a week from Monday to Sunday or else
+    a single day. Periods that are not available yet are covered by shorter
+    periods until their report is published.
+    """
+    result = []
+    cursor = start_date
+    while is_available(FREQUENCY_DAILY, cursor, now):
+        year_end = date(cursor.year, 12, 31)
+        month_end = date(
+            cursor.year,
+            cursor.month,
+            calendar.monthrange(cursor.year, cursor.month)[1],
+        )
+        week_end = cursor + timedelta(days=6)
+
+        if (cursor.month, cursor.day) == (1, 1) and is_available(
+            FREQUENCY_YEARLY, year_end, now
+        ):
+            result.append(_reporting_date(FREQUENCY_YEARLY, year_end))
+            cursor = year_end
+        elif cursor.day == 1 and is_available(FREQUENCY_MONTHLY, month_end, now):
+            result.append(_reporting_date(FREQUENCY_MONTHLY, month_end))
+            cursor = month_end
+        elif cursor.weekday() == 0 and is_available(FREQUENCY_WEEKLY, week_end, now):
+            result.append(_reporting_date(FREQUENCY_WEEKLY, week_end))
+            cursor = week_end
+        else:
+            result.append(_reporting_date(FREQUENCY_DAILY, cursor))
+        cursor += timedelta(days=1)
+
+    return result
+
+
+def superseded_reports(
+    reporting_dates: Iterable[dict[str, str]],
+    plan: list[dict[str, str]],
+    available: set[str],
+) -> list[dict[str, str]]:
+    """Return the daily and weekly reports that a planned report replaces.
+
+    A report is superseded when it is not part of the plan and every day it
+    covers is covered by a planned monthly or yearly report that is available.
+    Monthly reports are kept, they are needed for the history per month.
+    """
+    covered: list[tuple[date, date]] = [
+        report_period(reporting_date)
+        for reporting_date in plan
+        if reporting_date["frequency"] in (FREQUENCY_MONTHLY, FREQUENCY_YEARLY)
+        and report_key(reporting_date) in available
+    ]
+    planned = {report_key(reporting_date) for reporting_date in plan}
+
+    result = []
+    for reporting_date in reporting_dates:
+        if (
+            reporting_date["frequency"] not in (FREQUENCY_DAILY, FREQUENCY_WEEKLY)
+            or report_key(reporting_date) in planned
+        ):
+            continue
+        begin, end = report_period(reporting_date)
+        # a week can be covered by the end of one month and the start of the next
+        days = (
+            begin + timedelta(days=offset) for offset in range((end - begin).days + 1)
+        )
+        if all(any(first <= day <= last for first, last in covered) for day in days):
+            result.append(reporting_date)
+    return result
+
+
+def ingested_cover(
+    plan: list[dict[str, str]], ingested: Iterable[str]
+) -> list[dict[str, str]]:
+    """Return the ingested reports that cover the most days of a plan.
+
+    A planned report that is not ingested yet, for example a monthly report
+    replacing the daily reports of its month, leaves its days covered by the
+    ingested shorter reports until it is ingested. No day is covered twice,
+    and of the covers of the most days the one of the fewest reports is
+    returned.
+    """
+    if not plan:
+        return []
+    first = report_period(plan[0])[0]
+    days = (report_period(plan[-1])[1] - first).days + 1
+
+    # ingested reports within the plan by the offset of their first day
+    starting: dict[int, list[tuple[int, dict[str, str]]]] = {}
+    for key in ingested:
+        reporting_date = parse_report_key(key)
+        begin, end = report_period(reporting_date)
+        if begin >= first and (end - first).days < days:
+            starting.setdefault((begin - first).days, []).append(
+                ((end - begin).days + 1, reporting_date)
+            )
+
+    # score[offset] is (days covered, -reports) of the best cover from the
+    # day at the offset on, chosen[offset] the report it starts with
+    score: list[tuple[int, int]] = [(0, 0)] * (days + 1)
+    chosen: list[tuple[int, dict[str, str]] | None] = [None] * (days + 1)
+    for offset in range(days - 1, -1, -1):
+        score[offset] = score[offset + 1]
+        for length, reporting_date in starting.get(offset, []):
+            covered, reports = score[offset + length]
+            if (covered + length, reports - 1) > score[offset]:
+                score[offset] = (covered + length, reports - 1)
+                chosen[offset] = (length, reporting_date)
+
+    result = []
+    offset = 0
+    while offset < days:
+        choice = chosen[offset]
+        if choice is None:
+            offset += 1
+            continue
+        length, reporting_date = choice
+        result.append(reporting_date)
+        offset += length
+    return result
+
+
+def report_key(reporting_date: dict[str, str]) -> str:
+    """Return the key of a report."""
+    return "{}-{}".format(reporting_date["frequency"], reporting_date["reportDate"])
+
+
+def parse_report_key(key: str) -> dict[str, str]:
+    """Return the reporting date of a report key."""
+    frequency, report_date = key.split("-", 1)
+    return {"frequency": frequency, "reportDate": report_date}
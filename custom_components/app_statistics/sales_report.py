@@ -0,0 +1,108 @@
+"""Read App Store Connect sales reports."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, IO
+
+from .report_files import open_report_file
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# https://help.apple.com/app-store-connect/en.lproj/static.html#dev63c6f4502
+# bought app installs, no app updates
+INSTALL_PRODUCT_TYPES = ["1", "1F", "1T", "F1"]
+
+# columns a sales report is grouped by before it is stored
+GROUP_COLUMNS = [
+    "SKU",
+    "Product Type Identifier",
+    "Country Code",
+    "Begin Date",
+    "End Date",
+]
+
+# only the grouped columns and the units are read, with fixed types so they
+# are not inferred for every chunk
+USE_COLUMNS = GROUP_COLUMNS + ["Units"]
+COLUMN_TYPES = {**{column: str for column in GROUP_COLUMNS}, "Units": "float64"}
+
+# rows parsed at once, bounds the memory used for a large vendor account
+CHUNK_ROWS = 50_000
+# grouped chunks that are kept before they are merged
+MERGE_CHUNKS = 8
+
+
+@lru_cache(maxsize=1024)
+def _iso_date(value: str) -> str:
+    """Convert a MM/DD/YYYY report date to an ISO date."""
+    return datetime.strptime(value, "%m/%d/%Y").date().isoformat()
+
+
+def read_sales_report(
+    report: str | IO[bytes],
+) -> list[tuple[str, str, str, str, str, int]]:
+    """Return the units of a sales report per SKU, product type, country and period.
+
+    The report is a path or a binary file. It is read in chunks that are
+    grouped as they are read, so only the grouped units are kept in memory.
+    Rows are returned as (sku, product type, country, begin date, end date,
+    units) with ISO dates.
+    """
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    grouped: list[pd.Series] = []
+    with pd.read_csv(
+        report,
+        sep="\t",
+        usecols=USE_COLUMNS,
+        dtype=COLUMN_TYPES,
+        chunksize=CHUNK_ROWS,
+    ) as reader:
+        for chunk in reader:
+            # empty values are grouped as empty strings, NaN is not equal to itself
+            chunk = chunk.fillna({column: "" for column in GROUP_COLUMNS})
+            grouped.append(chunk.groupby(GROUP_COLUMNS, sort=False)["Units"].sum())
+            if len(grouped) >= MERGE_CHUNKS:
+                grouped = [_merge(grouped, sort=False)]
+
+    if not grouped:
+        return []
+    return [
+        (
+            sku or None,
+            product_type or None,
+            country or None,
+            _iso_date(begin),
+            _iso_date(end),
+            int(units),
+        )
+        for (sku, product_type, country, begin, end), units in _merge(
+            grouped, sort=True
+        ).items()
+    ]
+
+
+def _merge(grouped: list[pd.Series], sort: bool) -> pd.Series:
+    """Add up the units of grouped chunks."""
+    import pandas as pd  # pylint: disable=import-outside-toplevel
+
+    return (
+        pd.concat(grouped)
+        .groupby(level=list(range(len(GROUP_COLUMNS))), sort=sort)
+        .sum()
+    )
+
+
+def read_sales_report_file(
+    file_path: str,
+) -> list[tuple[str, str, str, str, str, int]]:
+    """Return the grouped units of a gzip compressed sales report file.
+
+    The report is decompressed while it is parsed, and only the grouped rows
+    are sent back when it runs in a worker process.
+    """
+    with open_report_file(file_path) as report:
+        return read_sales_report(report)
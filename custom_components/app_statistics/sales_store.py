@@ -0,0 +1,159 @@
+"""Local store of the parsed App Store Connect sales reports."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+import os
+import sqlite3
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    report_key TEXT PRIMARY KEY,
+    frequency TEXT NOT NULL,
+    report_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sales (
+    report_key TEXT NOT NULL REFERENCES reports (report_key) ON DELETE CASCADE,
+    sku TEXT,
+    product_type TEXT,
+    country TEXT,
+    begin_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    units INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sales_report_key ON sales (report_key);
+CREATE INDEX IF NOT EXISTS sales_sku ON sales (sku, product_type);
+CREATE INDEX IF NOT EXISTS sales_product_type ON sales (product_type);
+CREATE INDEX IF NOT EXISTS sales_country ON sales (country);
+CREATE INDEX IF NOT EXISTS sales_period ON sales (begin_date, end_date);
+"""
+
+
+class SalesStore:
+    """SQLite store with the units of every ingested sales report.
+
+    Every report is ingested once, after it is downloaded. Totals and
+    breakdowns are answered with indexed queries over the reports that are
+    passed in, so reports that are superseded by a longer period can stay in
+    the store without being counted twice. The store is used from executor
+    jobs, access to the connection is serialised with a lock.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Init sales store."""
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return the database connection, creating the schema if needed."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def report_keys(self) -> set[str]:
+        """Return the keys of all ingested reports."""
+        with self._lock:
+            return {
+                row[0]
+                for row in self.connection.execute("SELECT report_key FROM reports")
+            }
+
+    def add_report(
+        self,
+        report_key: str,
+        frequency: str,
+        report_date: str,
+        rows: Iterable[tuple[str, str, str, str, str, int]],
+    ) -> None:
+        """Ingest the rows of a sales report, replacing a previous ingest."""
+        with self._lock, self.connection as connection:
+            connection.execute(
+                "DELETE FROM reports WHERE report_key = ?", (report_key,)
+            )
+            connection.execute(
+                "INSERT INTO reports (report_key, frequency, report_date) "
+                "VALUES (?, ?, ?)",
+                (report_key, frequency, report_date),
+            )
+            connection.executemany(
+                "INSERT INTO sales (report_key, sku, product_type, country, "
+                "begin_date, end_date, units) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((report_key, *row) for row in rows),
+            )
+
+    def remove_report(self, report_key: str) -> None:
+        """Remove an ingested report and its rows."""
+        with self._lock, self.connection as connection:
+            connection.execute(
+                "DELETE FROM reports WHERE report_key = ?", (report_key,)
+            )
+
+    def units(
+        self,
+        report_keys: Iterable[str],
+        product_types: Iterable[str],
+        group_by: str = "sku",
+    ) -> dict[str | None, int]:
+        """Return the units of the given reports and product types.
+
+        The units are grouped by a column of the sales table, for example
+        ``sku`` or ``country``.
+        """
+        if group_by not in ("sku", "product_type", "country", "begin_date"):
+            raise ValueError(f"Can not group sales by {group_by}")
+        report_keys = list(report_keys)
+        product_types = list(product_types)
+        if not report_keys or not product_types:
+            return {}
+
+        query = (
+            f"SELECT {group_by}, SUM(units) FROM sales "
+            f"WHERE report_key IN ({', '.join('?' * len(report_keys))}) "
+            f"AND product_type IN ({', '.join('?' * len(product_types))}) "
+            f"GROUP BY {group_by}"
+        )
+        with self._lock:
+            return {
+                key: units
+                for key, units in self.connection.execute(
+                    query, (*report_keys, *product_types)
+                )
+            }
+
+    def units_per_period(
+        self, report_keys: Iterable[str], product_types: Iterable[str]
+    ) -> list[tuple[str | None, str, int]]:
+        """Return the units per SKU and period start of the given reports.
+
+        Rows are (sku, begin date, units), ordered by begin date.
+        """
+        report_keys = list(report_keys)
+        product_types = list(product_types)
+        if not report_keys or not product_types:
+            return []
+
+        query = (
+            "SELECT sku, begin_date, SUM(units) FROM sales "
+            f"WHERE report_key IN ({', '.join('?' * len(report_keys))}) "
+            f"AND product_type IN ({', '.join('?' * len(product_types))}) "
+            "GROUP BY sku, begin_date ORDER BY begin_date"
+        )
+        with self._lock:
+            return list(self.connection.execute(query, (*report_keys, *product_types)))
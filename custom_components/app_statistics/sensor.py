@@ -1,9 +1,10 @@
 """Support for the AccuWeather service."""
 from __future__ import annotations
+from dataclasses import dataclass
 import logging
-from typing import cast
+from typing import Any, cast
 
-from homeassistant.const import CONF_NAME, CURRENCY_EURO
+from homeassistant.const import CONF_NAME, CURRENCY_EURO, DATA_BYTES, TIME_SECONDS
 from homeassistant.helpers.typing import StateType
 
 from .const import (
@@ -13,16 +14,21 @@ from .const import (
     SENSOR_ADMOB_REVENUE_TODAY,
     SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS,
     SENSOR_IOS_TOTAL_INSTALLS,
+    SOURCE_ADMOB,
+    SOURCE_APP_STORE,
+    SOURCE_PLAY,
 )
 from .report_coordinator import ReportCoordinator
 
 from homeassistant.components.sensor import (
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -30,33 +36,110 @@ PARALLEL_UPDATES = 1
 
 _LOGGER = logging.getLogger(__name__)
 
-SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+
+@dataclass
+class AppStatisticsRequiredKeysMixin:
+    """Mixin for required keys."""
+
+    source: str
+
+
+@dataclass
+class AppStatisticsSensorEntityDescription(
+    SensorEntityDescription, AppStatisticsRequiredKeysMixin
+):
+    """Describes an App Statistics sensor entity."""
+
+    # the source reports a value per app instead of one for the account
+    per_app: bool = False
+
+
+SENSOR_TYPES: tuple[AppStatisticsSensorEntityDescription, ...] = (
+    AppStatisticsSensorEntityDescription(
         key=SENSOR_IOS_TOTAL_INSTALLS,
+        source=SOURCE_APP_STORE,
+        per_app=True,
         name="iOS total app installs",
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement="total installs",
     ),
-    SensorEntityDescription(
+    AppStatisticsSensorEntityDescription(
         key=SENSOR_ANDROID_CURRENT_ACTIVE_INSTALLS,
+        source=SOURCE_PLAY,
+        per_app=True,
         name="Android current active installs",
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement="active installs",
     ),
-    SensorEntityDescription(
+    AppStatisticsSensorEntityDescription(
         key=SENSOR_ADMOB_REVENUE_TODAY,
+        source=SOURCE_ADMOB,
         name="AdMob estimated revenue today",
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=CURRENCY_EURO,
     ),
-    SensorEntityDescription(
+    AppStatisticsSensorEntityDescription(
         key=SENSOR_ADMOB_REVENUE_MONTH,
+        source=SOURCE_ADMOB,
         name="AdMob estimated revenue this month",
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=CURRENCY_EURO,
     ),
 )
 
+SOURCE_NAMES = {
+    SOURCE_ADMOB: "AdMob",
+    SOURCE_PLAY: "Google Play",
+    SOURCE_APP_STORE: "App Store Connect",
+}
+
+# Metrics of the last update of every source, see metrics.py
+METRIC_SENSOR_TYPES: tuple[SensorEntityDescription, ...] = (
+    SensorEntityDescription(
+        key="last_duration",
+        name="update duration",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=TIME_SECONDS,
+    ),
+    SensorEntityDescription(
+        key="bytes_downloaded",
+        name="bytes downloaded",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=DATA_BYTES,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="reports_parsed",
+        name="reports parsed",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="cache_hits",
+        name="cache hits",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="cache_misses",
+        name="cache misses",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+    ),
+    SensorEntityDescription(
+        key="errors",
+        name="update errors",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -65,7 +148,7 @@ async def async_setup_entry(
     reports_config = entry.data["reports"]
     ios_app_bundle_id = reports_config.get(CONF_IOS_BUNDLE_ID)
 
-    coordinator: ReportCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinators: dict[str, ReportCoordinator] = hass.data[DOMAIN][entry.entry_id]
 
     if ios_app_bundle_id is None:
         _LOGGER.error("iOS App bundle ID is not set in Home Assistant config")
@@ -76,15 +159,47 @@ async def async_setup_entry(
         ios_app_bundle_id,
     )
 
-    entities = [
-        AppStatisticsSensor(
-            reports_config.get(CONF_NAME, "App Statistics"),
-            ios_app_bundle_id,
-            description,
-            coordinator,
-        )
-        for description in SENSOR_TYPES
-    ]
+    api = coordinators[SOURCE_APP_STORE].api
+    app_bundle_ids = {
+        SOURCE_APP_STORE: api.ios_bundle_ids,
+        SOURCE_PLAY: api.play_bundle_ids,
+    }
+    # sensors of the first app keep the unique IDs from before multiple apps
+    # were supported
+    primary_bundle_id = api.ios_bundle_ids[0]
+    client_name = reports_config.get(CONF_NAME, "App Statistics")
+
+    entities = []
+    for description in SENSOR_TYPES:
+        coordinator = coordinators[description.source]
+        if not description.per_app:
+            entities.append(
+                AppStatisticsSensor(
+                    client_name, primary_bundle_id, description, coordinator
+                )
+            )
+            continue
+
+        bundle_ids = app_bundle_ids[description.source]
+        for index, app_bundle_id in enumerate(bundle_ids):
+            entities.append(
+                AppStatisticsSensor(
+                    client_name,
+                    primary_bundle_id if index == 0 else app_bundle_id,
+                    description,
+                    coordinator,
+                    app_bundle_id=app_bundle_id,
+                    show_app_in_name=len(bundle_ids) > 1,
+                )
+            )
+
+    for source, coordinator in coordinators.items():
+        for metric_description in METRIC_SENSOR_TYPES:
+            entities.append(
+                AppStatisticsMetricSensor(
+                    client_name, primary_bundle_id, metric_description, coordinator
+                )
+            )
 
     async_add_entities(entities)
 
@@ -92,21 +207,31 @@ async def async_setup_entry(
 class AppStatisticsSensor(CoordinatorEntity[ReportCoordinator], SensorEntity):
     """Define an App Statistics entity."""
 
+    entity_description: AppStatisticsSensorEntityDescription
+
     def __init__(
         self,
         client_name: str,
-        app_bundle_id: str,
-        description: SensorEntityDescription,
+        unique_id_prefix: str,
+        description: AppStatisticsSensorEntityDescription,
         coordinator: ReportCoordinator,
+        app_bundle_id: str | None = None,
+        show_app_in_name: bool = False,
     ) -> None:
         """Initialize."""
         logging.debug("initializing sensor %i", description.key)
         super().__init__(coordinator)
         self.entity_description = description
-        self._attr_name = f"{client_name} {description.name}"
+        self._app_bundle_id = app_bundle_id
+        if show_app_in_name:
+            self._attr_name = f"{client_name} {app_bundle_id} {description.name}"
+        else:
+            self._attr_name = f"{client_name} {description.name}"
         self._measured = None
-        self._attr_unique_id = "{}{}".format(app_bundle_id, description.key)
-        self._sensor_data = _get_sensor_data(coordinator.data, description.key)
+        self._attr_unique_id = "{}{}".format(unique_id_prefix, description.key)
+        self._sensor_data = _get_sensor_data(
+            coordinator.data, description.key, app_bundle_id
+        )
 
     @property
     def native_value(self) -> StateType:
@@ -118,12 +243,54 @@ class AppStatisticsSensor(CoordinatorEntity[ReportCoordinator], SensorEntity):
         """Handle data update."""
         logging.debug("update data with %i", self.coordinator.data)
         self._sensor_data = _get_sensor_data(
-            self.coordinator.data, self.entity_description.key
+            self.coordinator.data, self.entity_description.key, self._app_bundle_id
         )
         self.async_write_ha_state()
 
 
-def _get_sensor_data(sensors: dict[str, int], kind: str) -> int:
+class AppStatisticsMetricSensor(CoordinatorEntity[ReportCoordinator], SensorEntity):
+    """Define a diagnostic entity with a metric of the updates of a source."""
+
+    def __init__(
+        self,
+        client_name: str,
+        unique_id_prefix: str,
+        description: SensorEntityDescription,
+        coordinator: ReportCoordinator,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_name = (
+            f"{client_name} {SOURCE_NAMES[coordinator.source]} {description.name}"
+        )
+        self._attr_unique_id = (
+            f"{unique_id_prefix}{coordinator.source}_{description.key}"
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True, the metrics are also known when an update failed."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state."""
+        metrics = self.coordinator.api.metrics[self.coordinator.source]
+        return cast(StateType, getattr(metrics, self.entity_description.key))
+
+
+def _get_sensor_data(
+    sensors: dict[str, Any] | None, kind: str, app_bundle_id: str | None = None
+) -> int | None:
     """Get sensor data."""
     logging.debug(kind)
-    return sensors[kind]
+    if sensors is None:
+        return None
+    value = sensors.get(kind)
+    if app_bundle_id is None:
+        return value
+    # values per app are keyed by the bundle ID of the app
+    if not isinstance(value, dict):
+        return None
+    return value.get(app_bundle_id)
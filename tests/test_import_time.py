@@ -0,0 +1,94 @@
+"""Test the import time of the integration against a budget.
+
+Imports the integration the way Home Assistant does when it loads it, with
+``-X importtime``, in a new interpreter. The Home Assistant modules the
+integration depends on are imported first, so only the cost of the
+integration itself is measured.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# seconds the integration modules may take to import together
+IMPORT_BUDGET = 0.2
+
+PACKAGE = "custom_components.app_statistics"
+MODULES = [
+    PACKAGE,
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.application_credentials",
+]
+HOME_ASSISTANT_MODULES = [
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.config_entry_oauth2_flow",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.update_coordinator",
+]
+# only imported in the executor when a report is downloaded or parsed
+LAZY_MODULES = [
+    "pandas",
+    "google.cloud.storage",
+    "googleapiclient",
+    "appstoreconnect",
+]
+
+CODE = """
+import sys
+{preload}
+{imports}
+print(",".join(module for module in {lazy!r} if module in sys.modules))
+"""
+
+
+@pytest.fixture(name="imported", scope="module")
+def imported_fixture() -> subprocess.CompletedProcess[str]:
+    """Import the integration in a new interpreter with -X importtime."""
+    code = CODE.format(
+        preload="\n".join(f"import {module}" for module in HOME_ASSISTANT_MODULES),
+        imports="\n".join(f"import {module}" for module in MODULES),
+        lazy=LAZY_MODULES,
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_import_time_within_budget(
+    imported: subprocess.CompletedProcess[str],
+) -> None:
+    """Test the integration modules import within the budget."""
+    # import time: self [us] | cumulative | imported package
+    timings: dict[str, int] = {}
+    for line in imported.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() in MODULES:
+            timings[name.strip()] = int(cumulative)
+
+    assert set(timings) == set(MODULES)
+    total = sum(timings.values()) / 1e6
+    assert total <= IMPORT_BUDGET, f"Import took {total * 1000:.0f} ms: {timings}"
+
+
+def test_libraries_imported_lazily(
+    imported: subprocess.CompletedProcess[str],
+) -> None:
+    """Test the report libraries are not imported when the integration loads."""
+    assert imported.stdout.strip() == ""
@@ -0,0 +1,40 @@
+"""Tests for the processes that parse sales reports."""
+
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from custom_components.app_statistics.parse_pool import ReportParsePool
+from custom_components.app_statistics.report_files import CorruptReportError
+
+pytest.importorskip("pandas")
+
+REPORT = (
+    "SKU\tProduct Type Identifier\tCountry Code\tBegin Date\tEnd Date\tUnits\n"
+    "com.example.app\t1F\tUS\t01/01/2021\t01/01/2021\t3\n"
+    "com.example.app\t1F\tUS\t01/01/2021\t01/01/2021\t2\n"
+)
+
+
+def test_workers_parse_without_home_assistant(tmp_path: Path) -> None:
+    """Test a worker parses reports without importing the integration."""
+    report = tmp_path / "report.csv.gz"
+    report.write_bytes(gzip.compress(REPORT.encode()))
+    corrupt = tmp_path / "corrupt.csv.gz"
+    corrupt.write_bytes(gzip.compress(REPORT.encode())[:-8])
+
+    pool = ReportParsePool(1)
+    try:
+        rows, error = pool.parse([str(report), str(corrupt)])
+        assert rows == [("com.example.app", "1F", "US", "2021-01-01", "2021-01-01", 5)]
+        assert isinstance(error, CorruptReportError)
+
+        # builtins are sent by name, so eval runs in the worker as it is
+        # pylint: disable-next=protected-access
+        modules = pool._get_executor().submit(eval, "list(__import__('sys').modules)")
+        assert "homeassistant" not in modules.result()
+    finally:
+        pool.shutdown()
@@ -0,0 +1,37 @@
+"""Tests for the adaptive poll schedule."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.app_statistics.const import SOURCE_PLAY
+from custom_components.app_statistics.poll_schedule import (
+    PUBLISH_WINDOW_BEFORE,
+    source_poll_schedule,
+)
+
+INTERVAL = timedelta(hours=1)
+
+
+def test_state_is_restored() -> None:
+    """Test the learned publish time and last change survive a restart."""
+    schedule = source_poll_schedule(SOURCE_PLAY, INTERVAL)
+    changed_at = datetime(2026, 3, 2, 8, 15, tzinfo=timezone.utc)
+    schedule.next_interval(changed_at, True)
+
+    restored = source_poll_schedule(SOURCE_PLAY, INTERVAL)
+    restored.restore(schedule.as_dict())
+    assert restored == schedule
+
+    # after a restart the next publish window is waited for
+    now = changed_at + timedelta(hours=20)
+    assert restored.next_interval(now, False) == (
+        changed_at + timedelta(days=1) - PUBLISH_WINDOW_BEFORE - now
+    )
+
+
+def test_nothing_is_restored_from_an_empty_state() -> None:
+    """Test a snapshot without a schedule state leaves the schedule unchanged."""
+    schedule = source_poll_schedule(SOURCE_PLAY, INTERVAL)
+    schedule.restore({})
+    assert schedule == source_poll_schedule(SOURCE_PLAY, INTERVAL)
@@ -0,0 +1,151 @@
+"""Tests for the plan of App Store Connect sales reports."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from custom_components.app_statistics.const import REPORTS_START_DATE
+from custom_components.app_statistics.report_planner import (
+    FREQUENCY_DAILY,
+    available_from,
+    ingested_cover,
+    is_available,
+    parse_report_key,
+    plan_reports,
+    report_key,
+    report_period,
+    superseded_reports,
+)
+
+BEFORE_PUBLISH = time(12, 59, tzinfo=timezone.utc)
+AFTER_PUBLISH = time(13, tzinfo=timezone.utc)
+
+
+def days_between(first: date, last: date) -> list[date]:
+    """Return every day from a first until a last day."""
+    return [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+
+
+def covered_days(reporting_dates: list[dict[str, str]]) -> list[date]:
+    """Return the days covered by reports, in the order of the reports."""
+    return [
+        day
+        for reporting_date in reporting_dates
+        for day in days_between(*report_period(reporting_date))
+    ]
+
+
+def keys(reporting_dates: list[dict[str, str]]) -> list[str]:
+    """Return the keys of reports."""
+    return [report_key(reporting_date) for reporting_date in reporting_dates]
+
+
+@pytest.mark.parametrize("publish_time", [BEFORE_PUBLISH, AFTER_PUBLISH])
+def test_plan_covers_every_available_day_once(publish_time: time) -> None:
+    """Test every day until the last available one is covered exactly once."""
+    for day in days_between(date(2021, 1, 1), date(2027, 12, 31)):
+        now = datetime.combine(day, publish_time)
+        plan = plan_reports(REPORTS_START_DATE, now)
+
+        # every report starts on the day after the previous one ends
+        next_day = REPORTS_START_DATE
+        for reporting_date in plan:
+            begin, end = report_period(reporting_date)
+            assert begin == next_day
+            assert now >= available_from(reporting_date)
+            next_day = end + timedelta(days=1)
+        assert not is_available(FREQUENCY_DAILY, next_day, now)
+        if plan:
+            assert is_available(FREQUENCY_DAILY, next_day - timedelta(days=1), now)
+
+
+def test_plan_switches_to_longer_report_when_published() -> None:
+    """Test a monthly and a yearly report are planned once they are published."""
+    before = datetime(2026, 1, 6, 12, 59, tzinfo=timezone.utc)
+    after = datetime(2026, 1, 6, 13, tzinfo=timezone.utc)
+
+    assert "YEARLY-2025" not in keys(plan_reports(date(2025, 1, 1), before))
+    assert "MONTHLY-2025-12" in keys(plan_reports(date(2025, 1, 1), before))
+    assert keys(plan_reports(date(2025, 1, 1), after))[0] == "YEARLY-2025"
+
+    before = datetime(2026, 3, 5, 12, 59, tzinfo=timezone.utc)
+    after = datetime(2026, 3, 5, 13, tzinfo=timezone.utc)
+    assert "MONTHLY-2026-02" not in keys(plan_reports(date(2026, 2, 1), before))
+    assert keys(plan_reports(date(2026, 2, 1), after)) == [
+        "MONTHLY-2026-02",
+        "DAILY-2026-03-01",
+        "DAILY-2026-03-02",
+        "DAILY-2026-03-03",
+        "DAILY-2026-03-04",
+    ]
+
+
+def test_is_available_agrees_with_available_from() -> None:
+    """Test a report is available from the time it is expected to be published."""
+    reporting_date = parse_report_key("MONTHLY-2026-02")
+    published = available_from(reporting_date)
+    _, end = report_period(reporting_date)
+
+    assert not is_available("MONTHLY", end, published - timedelta(seconds=1))
+    assert is_available("MONTHLY", end, published)
+
+
+def test_superseded_reports() -> None:
+    """Test daily and weekly reports are replaced by an ingested monthly report."""
+    plan = [parse_report_key("MONTHLY-2025-12")]
+    reports = [
+        parse_report_key(key)
+        for key in (
+            "DAILY-2025-12-01",
+            "WEEKLY-2025-12-07",
+            "DAILY-2025-12-31",
+            # ends in January, which is not covered by the plan
+            "WEEKLY-2026-01-04",
+            "MONTHLY-2025-11",
+            "MONTHLY-2025-12",
+        )
+    ]
+
+    assert keys(superseded_reports(reports, plan, {"MONTHLY-2025-12"})) == [
+        "DAILY-2025-12-01",
+        "WEEKLY-2025-12-07",
+        "DAILY-2025-12-31",
+    ]
+    # the monthly report is not ingested yet
+    assert not superseded_reports(reports, plan, set())
+
+
+def test_ingested_cover_keeps_shorter_reports_until_ingested() -> None:
+    """Test the days of a planned report are covered by the reports it replaces."""
+    now = datetime(2026, 1, 6, 13, tzinfo=timezone.utc)
+    plan = plan_reports(date(2025, 1, 1), now)
+    months = [f"MONTHLY-2025-{month:02}" for month in range(1, 13)]
+    days = [f"DAILY-2026-01-0{day}" for day in range(1, 6)]
+    assert keys(plan) == ["YEARLY-2025"] + days
+
+    cover = ingested_cover(plan, months + days)
+    assert keys(cover) == months + days
+    assert covered_days(cover) == covered_days(plan)
+
+    cover = ingested_cover(plan, ["YEARLY-2025"] + months + days)
+    assert keys(cover) == keys(plan)
+
+
+def test_ingested_cover_covers_no_day_twice() -> None:
+    """Test overlapping reports are not counted twice and gaps are left out."""
+    plan = [parse_report_key("MONTHLY-2025-12")]
+    ingested = [
+        "DAILY-2025-12-01",
+        "WEEKLY-2025-12-07",
+        "DAILY-2025-12-08",
+        "DAILY-2025-12-10",
+        # outside the plan
+        "WEEKLY-2026-01-04",
+        "DAILY-2025-11-30",
+    ]
+
+    cover = ingested_cover(plan, ingested)
+    assert keys(cover) == ["WEEKLY-2025-12-07", "DAILY-2025-12-08", "DAILY-2025-12-10"]
+    assert not ingested_cover([], ingested)